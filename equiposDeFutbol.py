@@ -4,7 +4,13 @@ import sqlite3
 import json
 import os
 import csv
+import hashlib
+import struct
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
@@ -12,18 +18,83 @@ from reportlab.lib.styles import getSampleStyleSheet
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
 import plotly.express as px
+import plotly.graph_objects as go
 from PIL import Image as PILImage
 import openpyxl
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuración de la base de datos
 DB_FILE = "equipos_futbol.db"
 
 # Configuración de paginación
 EQUIPOS_POR_PAGINA = 10
 
+# Filas renderizadas en el modo de desplazamiento virtual
+FILAS_VENTANA_VIRTUAL = 20
+
+# Campo de datos asociado a cada columna de la tabla
+CAMPOS_COLUMNAS = ("id_equipo", "nombre", "partidos_jugados", "puntos_totales",
+                   "goles_a_favor", "goles_en_contra", "puntos_local", "puntos_visitante",
+                   "diferencia_goles", "porcentaje_victorias", "goles_por_partido",
+                   "ataque", "defensa")
+
+# Campos de datos de un equipo, en el orden de las columnas de la tabla equipos
+CAMPOS_EQUIPO = ("nombre", "partidos_jugados", "ganados", "empatados", "perdidos",
+                 "goles_a_favor", "goles_en_contra", "puntos_totales", "puntos_local",
+                 "puntos_visitante", "diferencia_goles", "porcentaje_victorias", "goles_por_partido")
+
+# Campos de un equipo de los que dependen sus ratings, en el orden de calcular_ratings
+CAMPOS_RATING = ("partidos_jugados", "goles_a_favor", "goles_en_contra", "puntos_local", "puntos_visitante")
+
 # Máximo de goles por partido
 MAX_GOLES_POR_PARTIDO = 10
 
+# Métricas con posición y percentil precalculados: campo -> (etiqueta, True si mayor es mejor)
+METRICAS_RANGO = {
+    "puntos_totales": ("Puntos totales", True),
+    "goles_a_favor": ("Goles a favor", True),
+    "goles_en_contra": ("Goles en contra", False),
+    "diferencia_goles": ("Diferencia de goles", True),
+    "porcentaje_victorias": ("Porcentaje de victorias (%)", True),
+    "goles_por_partido": ("Goles por partido", True),
+    "puntos_local": ("Puntos de local", True),
+    "puntos_visitante": ("Puntos de visitante", True)
+}
+
+# Snapshot binario columnar de la tabla equipos
+MAGIA_SNAPSHOT = b"EQSNAP\0\0"
+FORMATO_SNAPSHOT = 2
+CABECERA_SNAPSHOT = struct.Struct("<8sIqqqII")
+TAMANO_CABECERA_SNAPSHOT = 64
+COLUMNAS_SNAPSHOT = (
+    ("partidos_jugados", "<i4"), ("ganados", "<i4"), ("empatados", "<i4"), ("perdidos", "<i4"),
+    ("goles_a_favor", "<i4"), ("goles_en_contra", "<i4"), ("puntos_totales", "<i4"),
+    ("puntos_local", "<i4"), ("puntos_visitante", "<i4"), ("diferencia_goles", "<i4"),
+    ("porcentaje_victorias", "<f8"), ("goles_por_partido", "<f8")
+)
+FILAS_POR_BLOQUE_SNAPSHOT = 50000
+
+# Equipos por lote en las importaciones por streaming
+LOTE_IMPORTACION = 1000
+
+# Jornadas máximas entre dos checkpoints completos del historial
+INTERVALO_CHECKPOINT = 5
+
+# Configuración de los gráficos para ligas grandes
+UMBRAL_LIGA_GRANDE = 50
+TOP_N_GRAFICOS = 20
+BINS_HISTOGRAMA = 40
+MAX_PUNTOS_DISPERSION = 20000
+
+# Configuración de la simulación de temporada
+SIMULACIONES_POR_LOTE = 5000
+PLAZAS_CLASIFICACION = 4
+PLAZAS_DESCENSO = 3
+
 # Diccionario de traducciones
 TRADUCCIONES = {
     "es": {
@@ -32,6 +103,8 @@ TRADUCCIONES = {
         "prev_page": "Anterior",
         "next_page": "Siguiente",
         "page_label": "Página {0} de {1}",
+        "rows_label": "Filas {0}-{1} de {2}",
+        "virtual_scroll": "Desplazamiento virtual",
         "id": "ID",
         "nombre": "Nombre",
         "partidos": "Partidos",
@@ -43,6 +116,8 @@ TRADUCCIONES = {
         "diferencia": "Diferencia goles",
         "porcentaje": "Porcentaje victorias",
         "goles_partido": "Goles por partido",
+        "ataque": "Ataque",
+        "defensa": "Defensa",
         "id_equipo": "ID del equipo",
         "nombre_equipo": "Nombre",
         "partidos_jugados": "Partidos jugados",
@@ -61,9 +136,18 @@ TRADUCCIONES = {
         "pdf": "Generar PDF",
         "exportar_csv": "Exportar a CSV",
         "importar_csv": "Importar desde CSV",
+        "sincronizar_csv": "Sincronizar desde CSV",
+        "eliminar_ausentes": "¿Eliminar los equipos que no aparecen en el CSV?",
         "exportar_excel": "Exportar a Excel",
+        "exportar_ndjson": "Exportar a JSON Lines",
+        "importar_json": "Importar desde JSON",
         "idioma": "Idioma:",
         "ranking": "Top 5 Equipos por Puntos",
+        "promedio_goles": "Promedio de goles por partido",
+        "promedio_puntos": "Promedio de puntos por partido",
+        "publicar": "Publicar todo",
+        "registrar_jornada": "Registrar jornada",
+        "simular": "Simular temporada",
         "error": "Error"
     },
     "en": {
@@ -72,6 +156,8 @@ TRADUCCIONES = {
         "prev_page": "Previous",
         "next_page": "Next",
         "page_label": "Page {0} of {1}",
+        "rows_label": "Rows {0}-{1} of {2}",
+        "virtual_scroll": "Virtual scrolling",
         "id": "ID",
         "nombre": "Name",
         "partidos": "Matches",
@@ -83,6 +169,8 @@ TRADUCCIONES = {
         "diferencia": "Goal Difference",
         "porcentaje": "Win Percentage",
         "goles_partido": "Goals per Match",
+        "ataque": "Attack",
+        "defensa": "Defence",
         "id_equipo": "Team ID",
         "nombre_equipo": "Name",
         "partidos_jugados": "Matches Played",
@@ -101,91 +189,257 @@ TRADUCCIONES = {
         "pdf": "Generate PDF",
         "exportar_csv": "Export to CSV",
         "importar_csv": "Import from CSV",
+        "sincronizar_csv": "Sync from CSV",
+        "eliminar_ausentes": "Delete teams missing from the CSV?",
         "exportar_excel": "Export to Excel",
+        "exportar_ndjson": "Export to JSON Lines",
+        "importar_json": "Import from JSON",
         "idioma": "Language:",
         "ranking": "Top 5 Teams by Points",
+        "promedio_goles": "Average goals per match",
+        "promedio_puntos": "Average points per match",
+        "publicar": "Publish all",
+        "registrar_jornada": "Record matchday",
+        "simular": "Simulate season",
         "error": "Error"
     }
 }
 
+# Migraciones del esquema, aplicadas en orden según PRAGMA user_version.
+# La migración N deja la base de datos en user_version = N.
+MIGRACIONES = [
+    # 1: esquema original
+    """
+    CREATE TABLE IF NOT EXISTS equipos (
+        id_equipo TEXT PRIMARY KEY,
+        nombre TEXT,
+        partidos_jugados INTEGER,
+        ganados INTEGER,
+        empatados INTEGER,
+        perdidos INTEGER,
+        goles_a_favor INTEGER,
+        goles_en_contra INTEGER,
+        puntos_totales INTEGER,
+        puntos_local INTEGER,
+        puntos_visitante INTEGER,
+        diferencia_goles INTEGER,
+        porcentaje_victorias REAL,
+        goles_por_partido REAL
+    );
+    """,
+    # 2: hash del contenido de cada equipo para la sincronización diferencial
+    """
+    CREATE TABLE IF NOT EXISTS equipos_hash (
+        id_equipo TEXT PRIMARY KEY,
+        hash TEXT NOT NULL
+    );
+    """,
+    # 3: métricas derivadas como columnas generadas (se reconstruye la tabla)
+    """
+    CREATE TABLE equipos_nueva (
+        id_equipo TEXT PRIMARY KEY,
+        nombre TEXT,
+        partidos_jugados INTEGER,
+        ganados INTEGER,
+        empatados INTEGER,
+        perdidos INTEGER,
+        goles_a_favor INTEGER,
+        goles_en_contra INTEGER,
+        puntos_totales INTEGER GENERATED ALWAYS AS (ganados * 3 + empatados) VIRTUAL,
+        puntos_local INTEGER,
+        puntos_visitante INTEGER,
+        diferencia_goles INTEGER GENERATED ALWAYS AS (goles_a_favor - goles_en_contra) VIRTUAL,
+        porcentaje_victorias REAL GENERATED ALWAYS AS (
+            CASE WHEN partidos_jugados > 0 THEN ROUND(ganados * 100.0 / partidos_jugados, 2) ELSE 0 END
+        ) VIRTUAL,
+        goles_por_partido REAL GENERATED ALWAYS AS (
+            CASE WHEN partidos_jugados > 0 THEN ROUND(goles_a_favor * 1.0 / partidos_jugados, 2) ELSE 0 END
+        ) VIRTUAL
+    );
+    INSERT INTO equipos_nueva (
+        id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos,
+        goles_a_favor, goles_en_contra, puntos_local, puntos_visitante
+    )
+    SELECT id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos,
+           goles_a_favor, goles_en_contra, puntos_local, puntos_visitante
+    FROM equipos;
+    DROP TABLE equipos;
+    ALTER TABLE equipos_nueva RENAME TO equipos;
+    """,
+    # 4: índice para el ranking por puntos cuando se lee SQLite sin snapshot
+    """
+    CREATE INDEX IF NOT EXISTS idx_equipos_puntos ON equipos (puntos_totales DESC);
+    ANALYZE;
+    """,
+    # 5: historial de clasificaciones por jornada (deltas y checkpoints)
+    """
+    CREATE TABLE IF NOT EXISTS historial_jornadas (
+        jornada INTEGER PRIMARY KEY,
+        checkpoint INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS historial_checkpoints (
+        jornada INTEGER,
+        id_equipo TEXT,
+        datos TEXT NOT NULL,
+        PRIMARY KEY (jornada, id_equipo)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS historial_deltas (
+        jornada INTEGER,
+        id_equipo TEXT,
+        datos TEXT,
+        PRIMARY KEY (jornada, id_equipo)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_checkpoints_equipo ON historial_checkpoints (id_equipo, jornada);
+    CREATE INDEX IF NOT EXISTS idx_deltas_equipo ON historial_deltas (id_equipo, jornada);
+    """,
+    # 6: contador de versión de los datos, incrementado en cada escritura sobre equipos
+    """
+    CREATE TABLE IF NOT EXISTS metadatos (
+        clave TEXT PRIMARY KEY,
+        valor INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO metadatos (clave, valor) VALUES ('version_datos', 0);
+    CREATE TRIGGER IF NOT EXISTS trg_equipos_insert AFTER INSERT ON equipos BEGIN
+        UPDATE metadatos SET valor = valor + 1 WHERE clave = 'version_datos';
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_equipos_update AFTER UPDATE ON equipos BEGIN
+        UPDATE metadatos SET valor = valor + 1 WHERE clave = 'version_datos';
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_equipos_delete AFTER DELETE ON equipos BEGIN
+        UPDATE metadatos SET valor = valor + 1 WHERE clave = 'version_datos';
+    END;
+    """,
+    # 7: identificador aleatorio de la base de datos, distinto si el archivo se recrea
+    """
+    INSERT OR IGNORE INTO metadatos (clave, valor) VALUES ('id_base_datos', random());
+    """,
+]
+
+# Campos almacenados de un equipo; el resto se calculan como columnas generadas
+CAMPOS_BASE = ("nombre", "partidos_jugados", "ganados", "empatados", "perdidos",
+               "goles_a_favor", "goles_en_contra", "puntos_local", "puntos_visitante")
+
+def version_esquema(conn):
+    """Devuelve la versión del esquema registrada en la base de datos."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def version_datos(conn):
+    """Devuelve el contador de versión de los datos de equipos."""
+    return conn.execute("SELECT valor FROM metadatos WHERE clave = 'version_datos'").fetchone()[0]
+
+def id_base_datos(conn):
+    """Devuelve el identificador aleatorio asignado a la base de datos al crearla."""
+    return conn.execute("SELECT valor FROM metadatos WHERE clave = 'id_base_datos'").fetchone()[0]
+
 def init_db():
-    """Inicializa la base de datos SQLite."""
+    """Inicializa la base de datos SQLite aplicando las migraciones pendientes."""
     with sqlite3.connect(DB_FILE) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS equipos (
-                id_equipo TEXT PRIMARY KEY,
-                nombre TEXT,
-                partidos_jugados INTEGER,
-                ganados INTEGER,
-                empatados INTEGER,
-                perdidos INTEGER,
-                goles_a_favor INTEGER,
-                goles_en_contra INTEGER,
-                puntos_totales INTEGER,
-                puntos_local INTEGER,
-                puntos_visitante INTEGER,
-                diferencia_goles INTEGER,
-                porcentaje_victorias REAL,
-                goles_por_partido REAL
-            )
-        """)
-        conn.commit()
+        version = version_esquema(conn)
+        for numero, script in enumerate(MIGRACIONES[version:], version + 1):
+            conn.executescript(f"BEGIN;\n{script}\nPRAGMA user_version = {numero};\nCOMMIT;")
+
+def _fila_a_equipo(row):
+    """Convierte una fila de la tabla equipos en un diccionario de datos."""
+    return {
+        "nombre": row[1],
+        "partidos_jugados": row[2],
+        "ganados": row[3],
+        "empatados": row[4],
+        "perdidos": row[5],
+        "goles_a_favor": row[6],
+        "goles_en_contra": row[7],
+        "puntos_totales": row[8],
+        "puntos_local": row[9],
+        "puntos_visitante": row[10],
+        "diferencia_goles": row[11],
+        "porcentaje_victorias": row[12],
+        "goles_por_partido": row[13]
+    }
+
+def _cargar_equipos(cursor):
+    """Carga todos los equipos usando un cursor ya abierto."""
+    cursor.execute("SELECT * FROM equipos")
+    return {row[0]: _fila_a_equipo(row) for row in cursor.fetchall()}
 
 def cargar_datos():
     """Carga los datos desde la base de datos SQLite."""
-    equipos_db = {}
     with sqlite3.connect(DB_FILE) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM equipos")
-        for row in cursor.fetchall():
-            equipos_db[row[0]] = {
-                "nombre": row[1],
-                "partidos_jugados": row[2],
-                "ganados": row[3],
-                "empatados": row[4],
-                "perdidos": row[5],
-                "goles_a_favor": row[6],
-                "goles_en_contra": row[7],
-                "puntos_totales": row[8],
-                "puntos_local": row[9],
-                "puntos_visitante": row[10],
-                "diferencia_goles": row[11],
-                "porcentaje_victorias": row[12],
-                "goles_por_partido": row[13]
-            }
-    return equipos_db
+        return _cargar_equipos(conn.cursor())
 
-def guardar_equipo(id_equipo, equipo_data):
-    """Guarda o actualiza un equipo en la base de datos."""
+def redondear(valor):
+    """Redondea a dos decimales igual que ROUND de SQLite (mitades hacia arriba)."""
+    return float(Decimal(repr(valor)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+def calcular_metricas(equipo):
+    """Calcula las métricas derivadas de un equipo a partir de sus campos base."""
+    equipo["puntos_totales"] = equipo["ganados"] * 3 + equipo["empatados"]
+    equipo["diferencia_goles"] = equipo["goles_a_favor"] - equipo["goles_en_contra"]
+    equipo["porcentaje_victorias"] = redondear(equipo["ganados"] * 100.0 / equipo["partidos_jugados"] 
+                                               if equipo["partidos_jugados"] > 0 else 0)
+    equipo["goles_por_partido"] = redondear(equipo["goles_a_favor"] * 1.0 / equipo["partidos_jugados"] 
+                                            if equipo["partidos_jugados"] > 0 else 0)
+    return equipo
+
+def hash_equipo(equipo_data):
+    """Calcula el hash del contenido de un equipo para detectar cambios."""
+    contenido = json.dumps([equipo_data[campo] for campo in CAMPOS_EQUIPO], ensure_ascii=False)
+    return hashlib.blake2b(contenido.encode("utf-8"), digest_size=16).hexdigest()
+
+def _parametros_equipo(id_equipo, equipo_data):
+    """Devuelve los parámetros de inserción de un equipo."""
+    return (id_equipo,) + tuple(equipo_data[campo] for campo in CAMPOS_BASE)
+
+def _guardar_equipos(cursor, equipos):
+    """Guarda una lista de (id_equipo, equipo_data) junto con sus hashes de contenido."""
+    cursor.executemany("""
+        INSERT OR REPLACE INTO equipos (
+            id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos,
+            goles_a_favor, goles_en_contra, puntos_local, puntos_visitante
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [_parametros_equipo(id_equipo, equipo_data) for id_equipo, equipo_data in equipos])
+    cursor.executemany("INSERT OR REPLACE INTO equipos_hash (id_equipo, hash) VALUES (?, ?)",
+                       [(id_equipo, hash_equipo(equipo_data)) for id_equipo, equipo_data in equipos])
+
+def _eliminar_equipos(cursor, ids):
+    """Elimina una lista de equipos y sus hashes de contenido."""
+    parametros = [(id_equipo,) for id_equipo in ids]
+    cursor.executemany("DELETE FROM equipos WHERE id_equipo = ?", parametros)
+    cursor.executemany("DELETE FROM equipos_hash WHERE id_equipo = ?", parametros)
+
+@contextmanager
+def _transaccion_escritura():
+    """Abre una transacción de escritura y, al confirmarla, lleva los cambios al snapshot.
+
+    Produce (cursor, cambiados): quien escribe añade a cambiados los IDs que inserta, actualiza
+    o elimina. Sus filas se leen antes de confirmar, así el snapshot refleja exactamente la
+    versión escrita aunque otro proceso escriba justo después.
+    """
     with sqlite3.connect(DB_FILE) as conn:
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT OR REPLACE INTO equipos (
-                id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos,
-                goles_a_favor, goles_en_contra, puntos_totales, puntos_local,
-                puntos_visitante, diferencia_goles, porcentaje_victorias, goles_por_partido
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            id_equipo, equipo_data["nombre"], equipo_data["partidos_jugados"],
-            equipo_data["ganados"], equipo_data["empatados"], equipo_data["perdidos"],
-            equipo_data["goles_a_favor"], equipo_data["goles_en_contra"],
-            equipo_data["puntos_totales"], equipo_data["puntos_local"],
-            equipo_data["puntos_visitante"], equipo_data["diferencia_goles"],
-            equipo_data["porcentaje_victorias"], equipo_data["goles_por_partido"]
-        ))
+        conn.execute("BEGIN IMMEDIATE")
+        anterior = version_datos(conn)
+        cambiados = set()
+        yield conn.cursor(), cambiados
+        identificador, version = id_base_datos(conn), version_datos(conn)
+        filas = _filas_snapshot(conn, cambiados) if len(cambiados) <= LOTE_IMPORTACION else None
         conn.commit()
+    actualizar_snapshot(identificador, anterior, version, cambiados, filas)
+
+def guardar_equipo(id_equipo, equipo_data):
+    """Guarda o actualiza un equipo en la base de datos."""
+    with _transaccion_escritura() as (cursor, cambiados):
+        _guardar_equipos(cursor, [(id_equipo, equipo_data)])
+        cambiados.add(id_equipo)
 
 def eliminar_equipo_db(id_equipo):
     """Elimina un equipo de la base de datos."""
-    with sqlite3.connect(DB_FILE) as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM equipos WHERE id_equipo = ?", (id_equipo,))
-        conn.commit()
+    with _transaccion_escritura() as (cursor, cambiados):
+        _eliminar_equipos(cursor, [id_equipo])
+        cambiados.add(id_equipo)
 
-def exportar_a_csv():
+def exportar_a_csv(equipos_db=None):
     """Exporta los datos a un archivo CSV."""
-    equipos_db = cargar_datos()
+    if equipos_db is None:
+        equipos_db = leer_equipos()
     if not equipos_db:
         raise ValueError("No hay equipos para exportar.")
     with open("equipos_data.csv", 'w', newline='') as file:
@@ -203,9 +457,10 @@ def exportar_a_csv():
                              equipo["porcentaje_victorias"], equipo["goles_por_partido"]])
     return "equipos_data.csv"
 
-def exportar_a_excel():
+def exportar_a_excel(equipos_db=None):
     """Exporta los datos a un archivo Excel."""
-    equipos_db = cargar_datos()
+    if equipos_db is None:
+        equipos_db = leer_equipos()
     if not equipos_db:
         raise ValueError("No hay equipos para exportar.")
     df = pd.DataFrame([
@@ -257,6 +512,232 @@ def importar_desde_csv():
     except Exception as e:
         raise ValueError(f"Error al importar CSV: {str(e)}")
 
+def _clasificar_cambios(entrantes, hashes, resumen):
+    """Compara los equipos entrantes con los hashes guardados y devuelve los que hay que escribir.
+
+    Actualiza en resumen los contadores de insertados, actualizados y omitidos.
+    """
+    cambios = []
+    for id_equipo, equipo_data in entrantes.items():
+        if id_equipo not in hashes:
+            resumen["insertados"] += 1
+        elif hashes[id_equipo] == hash_equipo(equipo_data):
+            resumen["omitidos"] += 1
+            continue
+        else:
+            resumen["actualizados"] += 1
+        cambios.append((id_equipo, equipo_data))
+    return cambios
+
+def sincronizar_desde_csv(file_path, eliminar_ausentes=False):
+    """Fusiona un CSV con la base de datos escribiendo solo las filas cuyo contenido cambió.
+
+    Devuelve un resumen con los equipos insertados, actualizados, omitidos y eliminados.
+    """
+    try:
+        entrantes = {}
+        with open(file_path, 'r') as file:
+            reader = csv.DictReader(file)
+            for row in reader:
+                if None in row.values():
+                    raise ValueError(f"La fila {reader.line_num} tiene menos campos que la cabecera.")
+                id_equipo = row["ID"].strip()
+                if not id_equipo:
+                    raise ValueError("El ID del equipo debe ser una cadena no vacía.")
+                try:
+                    entrantes[id_equipo] = construir_equipo(
+                        nombre=row["Nombre"],
+                        partidos_jugados=int(row["Partidos jugados"]),
+                        ganados=int(row["Ganados"]),
+                        empatados=int(row["Empatados"]),
+                        perdidos=int(row["Perdidos"]),
+                        goles_a_favor=int(row["Goles a favor"]),
+                        goles_en_contra=int(row["Goles en contra"]),
+                        puntos_local=int(row["Puntos local"]),
+                        puntos_visitante=int(row["Puntos visitante"])
+                    )
+                except ValueError as e:
+                    raise ValueError(f"Equipo {id_equipo}: {str(e)}")
+    except (OSError, KeyError, ValueError) as e:
+        raise ValueError(f"Error al importar CSV: {str(e)}")
+    
+    resumen = {"insertados": 0, "actualizados": 0, "omitidos": 0, "eliminados": 0}
+    with _transaccion_escritura() as (cursor, cambiados):
+        cursor.execute("""
+            SELECT e.id_equipo, h.hash FROM equipos e
+            LEFT JOIN equipos_hash h ON h.id_equipo = e.id_equipo
+        """)
+        hashes = dict(cursor.fetchall())
+        
+        cambios = _clasificar_cambios(entrantes, hashes, resumen)
+        _guardar_equipos(cursor, cambios)
+        cambiados.update(id_equipo for id_equipo, _ in cambios)
+        
+        if eliminar_ausentes:
+            ausentes = [id_equipo for id_equipo in hashes if id_equipo not in entrantes]
+            _eliminar_equipos(cursor, ausentes)
+            cambiados.update(ausentes)
+            resumen["eliminados"] = len(ausentes)
+    return resumen
+
+def _json_dumps(obj):
+    """Serializa un objeto a JSON en bytes, con orjson si está instalado."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+def _json_loads(datos):
+    """Deserializa JSON, con orjson si está instalado."""
+    if orjson is not None:
+        return orjson.loads(datos)
+    return json.loads(datos)
+
+def exportar_a_ndjson(file_path="equipos_data.ndjson"):
+    """Exporta los equipos en formato JSON Lines leyendo el cursor fila a fila."""
+    escritos = 0
+    with sqlite3.connect(DB_FILE) as conn, open(file_path, 'wb') as file:
+        for row in conn.execute("SELECT * FROM equipos"):
+            file.write(_json_dumps({"id_equipo": row[0], **_fila_a_equipo(row)}) + b"\n")
+            escritos += 1
+    if not escritos:
+        os.remove(file_path)
+        raise ValueError("No hay equipos para exportar.")
+    return file_path
+
+def leer_ndjson(file_path):
+    """Lee un archivo JSON Lines y produce pares (id_equipo, datos)."""
+    with open(file_path, 'rb') as file:
+        for numero, linea in enumerate(file, 1):
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                datos = _json_loads(linea)
+            except ValueError as e:
+                raise ValueError(f"Línea {numero} no es JSON válido: {str(e)}")
+            if not isinstance(datos, dict):
+                raise ValueError(f"La línea {numero} debe ser un objeto JSON.")
+            yield datos.get("id_equipo"), datos
+
+def leer_json_anidado(file_path, tamano_bloque=65536):
+    """Lee incrementalmente un JSON con formato {id_equipo: {...}} y produce pares (id_equipo, datos).
+
+    Solo mantiene en memoria el bloque actual y el equipo que se está decodificando.
+    """
+    decodificador = json.JSONDecoder()
+    with open(file_path, 'r', encoding='utf-8') as file:
+        buffer, pos = "", 0
+        
+        def siguiente_caracter():
+            nonlocal buffer, pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                bloque = file.read(tamano_bloque)
+                if not bloque:
+                    raise ValueError("El archivo JSON está incompleto.")
+                buffer, pos = bloque, 0
+        
+        def siguiente_valor():
+            nonlocal buffer, pos
+            siguiente_caracter()
+            while True:
+                try:
+                    valor, fin = decodificador.raw_decode(buffer, pos)
+                    pos = fin
+                    return valor
+                except json.JSONDecodeError:
+                    bloque = file.read(tamano_bloque)
+                    if not bloque:
+                        raise
+                    buffer, pos = buffer[pos:] + bloque, 0
+        
+        if siguiente_caracter() != "{":
+            raise ValueError("El archivo JSON debe ser un objeto {id_equipo: datos}.")
+        pos += 1
+        if siguiente_caracter() == "}":
+            pos += 1
+        else:
+            while True:
+                id_equipo = siguiente_valor()
+                if siguiente_caracter() != ":":
+                    raise ValueError("Se esperaba ':' en el archivo JSON.")
+                pos += 1
+                datos = siguiente_valor()
+                if not isinstance(id_equipo, str) or not isinstance(datos, dict):
+                    raise ValueError("El archivo JSON debe ser un objeto {id_equipo: datos}.")
+                yield id_equipo, datos
+                separador = siguiente_caracter()
+                pos += 1
+                if separador == "}":
+                    break
+                if separador != ",":
+                    raise ValueError("Se esperaba ',' o '}' en el archivo JSON.")
+        
+        # Tras el objeto solo puede haber espacios en blanco
+        while True:
+            if buffer[pos:].strip():
+                raise ValueError("Hay contenido después del objeto JSON.")
+            bloque = file.read(tamano_bloque)
+            if not bloque:
+                return
+            buffer, pos = bloque, 0
+
+def _equipo_desde_json(id_equipo, datos):
+    """Valida un equipo leído de JSON y calcula sus métricas derivadas."""
+    if not isinstance(id_equipo, str) or not id_equipo.strip():
+        raise ValueError("El ID del equipo debe ser una cadena no vacía.")
+    try:
+        return construir_equipo(**{campo: datos[campo] for campo in CAMPOS_BASE})
+    except KeyError as e:
+        raise ValueError(f"Equipo {id_equipo}: falta el campo {e}")
+    except ValueError as e:
+        raise ValueError(f"Equipo {id_equipo}: {str(e)}")
+
+def importar_por_lotes(pares, tamano_lote=LOTE_IMPORTACION):
+    """Importa pares (id_equipo, datos) en lotes, escribiendo solo los equipos nuevos o cambiados.
+
+    Todo se aplica en una única transacción. Devuelve un resumen con los equipos
+    insertados, actualizados y omitidos.
+    """
+    resumen = {"insertados": 0, "actualizados": 0, "omitidos": 0}
+    with _transaccion_escritura() as (cursor, cambiados):
+        
+        def escribir_lote(lote):
+            marcadores = ", ".join("?" * len(lote))
+            cursor.execute(f"""
+                SELECT e.id_equipo, h.hash FROM equipos e
+                LEFT JOIN equipos_hash h ON h.id_equipo = e.id_equipo
+                WHERE e.id_equipo IN ({marcadores})
+            """, list(lote))
+            cambios = _clasificar_cambios(lote, dict(cursor.fetchall()), resumen)
+            _guardar_equipos(cursor, cambios)
+            cambiados.update(id_equipo for id_equipo, _ in cambios)
+        
+        lote = {}
+        for id_equipo, datos in pares:
+            id_equipo = id_equipo.strip() if isinstance(id_equipo, str) else id_equipo
+            lote[id_equipo] = _equipo_desde_json(id_equipo, datos)
+            if len(lote) >= tamano_lote:
+                escribir_lote(lote)
+                lote = {}
+        if lote:
+            escribir_lote(lote)
+    return resumen
+
+def importar_desde_json(file_path):
+    """Importa equipos desde JSON Lines (.ndjson/.jsonl) o desde el formato anidado de equipos_data.json."""
+    if file_path.lower().endswith(".json"):
+        pares = leer_json_anidado(file_path)
+    else:
+        pares = leer_ndjson(file_path)
+    try:
+        return importar_por_lotes(pares)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Error al importar JSON: {str(e)}")
+
 def validar_no_negativo(valor, nombre_campo):
     """Valida que un valor numérico no sea negativo."""
     if not isinstance(valor, (int, float)) or valor < 0:
@@ -292,10 +773,9 @@ def validar_goles(partidos_jugados, goles_a_favor, goles_en_contra):
     if goles_a_favor > max_goles or goles_en_contra > max_goles:
         raise ValueError(f"Los goles (a favor o en contra) no pueden exceder {max_goles} para {partidos_jugados} partidos.")
 
-def crear_equipo(id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos, 
-                 goles_a_favor, goles_en_contra, puntos_local, puntos_visitante):
-    """Crea un nuevo equipo y lo agrega a la base de datos."""
-    id_equipo = validar_id_equipo(id_equipo)
+def construir_equipo(nombre, partidos_jugados, ganados, empatados, perdidos,
+                     goles_a_favor, goles_en_contra, puntos_local, puntos_visitante):
+    """Valida los datos de un equipo y calcula sus métricas derivadas."""
     nombre = validar_nombre_equipo(nombre)
     partidos_jugados = validar_no_negativo(partidos_jugados, "Partidos jugados")
     ganados = validar_no_negativo(ganados, "Partidos ganados")
@@ -317,11 +797,7 @@ def crear_equipo(id_equipo, nombre, partidos_jugados, ganados, empatados, perdid
     validar_puntos_maximos(partidos_jugados, puntos_local, puntos_visitante, puntos_totales)
     validar_goles(partidos_jugados, goles_a_favor, goles_en_contra)
     
-    diferencia_goles = goles_a_favor - goles_en_contra
-    porcentaje_victorias = (ganados / partidos_jugados * 100) if partidos_jugados > 0 else 0
-    goles_por_partido = goles_a_favor / partidos_jugados if partidos_jugados > 0 else 0
-    
-    equipo_data = {
+    return calcular_metricas({
         "nombre": nombre,
         "partidos_jugados": partidos_jugados,
         "ganados": ganados,
@@ -329,23 +805,28 @@ def crear_equipo(id_equipo, nombre, partidos_jugados, ganados, empatados, perdid
         "perdidos": perdidos,
         "goles_a_favor": goles_a_favor,
         "goles_en_contra": goles_en_contra,
-        "puntos_totales": puntos_totales,
         "puntos_local": puntos_local,
-        "puntos_visitante": puntos_visitante,
-        "diferencia_goles": diferencia_goles,
-        "porcentaje_victorias": round(porcentaje_victorias, 2),
-        "goles_por_partido": round(goles_por_partido, 2)
-    }
-    
+        "puntos_visitante": puntos_visitante
+    })
+
+def crear_equipo(id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos, 
+                 goles_a_favor, goles_en_contra, puntos_local, puntos_visitante):
+    """Crea un nuevo equipo y lo agrega a la base de datos."""
+    id_equipo = validar_id_equipo(id_equipo)
+    equipo_data = construir_equipo(nombre, partidos_jugados, ganados, empatados, perdidos,
+                                   goles_a_favor, goles_en_contra, puntos_local, puntos_visitante)
     guardar_equipo(id_equipo, equipo_data)
     return id_equipo
 
 def leer_equipo(id_equipo):
     """Lee los datos de un equipo por su ID."""
-    equipos_db = cargar_datos()
-    if id_equipo not in equipos_db:
+    with sqlite3.connect(DB_FILE) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM equipos WHERE id_equipo = ?", (id_equipo,))
+        row = cursor.fetchone()
+    if row is None:
         raise ValueError("El equipo no existe.")
-    return equipos_db[id_equipo]
+    return _fila_a_equipo(row)
 
 def actualizar_equipo(id_equipo, **kwargs):
     """Actualiza los datos de un equipo existente."""
@@ -361,12 +842,7 @@ def actualizar_equipo(id_equipo, **kwargs):
                      "goles_a_favor", "goles_en_contra", "puntos_local", "puntos_visitante"]:
             equipo[key] = validar_no_negativo(value, key.replace("_", " ").capitalize())
     
-    equipo["puntos_totales"] = equipo["ganados"] * 3 + equipo["empatados"]
-    equipo["diferencia_goles"] = equipo["goles_a_favor"] - equipo["goles_en_contra"]
-    equipo["porcentaje_victorias"] = round((equipo["ganados"] / equipo["partidos_jugados"] * 100) 
-                                           if equipo["partidos_jugados"] > 0 else 0, 2)
-    equipo["goles_por_partido"] = round(equipo["goles_a_favor"] / equipo["partidos_jugados"] 
-                                        if equipo["partidos_jugados"] > 0 else 0, 2)
+    calcular_metricas(equipo)
     
     if equipo["puntos_local"] + equipo["puntos_visitante"] != equipo["puntos_totales"]:
         raise ValueError("La suma de puntos de local y visitante debe igualar los puntos totales.")
@@ -384,9 +860,162 @@ def eliminar_equipo(id_equipo):
         raise ValueError("El equipo no existe.")
     eliminar_equipo_db(id_equipo)
 
-def calcular_promedios_liga():
+def _base_equipo(equipo):
+    """Extrae los campos base de un equipo."""
+    return {campo: equipo[campo] for campo in CAMPOS_BASE}
+
+def _delta_equipo(anterior, actual):
+    """Codifica el cambio de un equipo entre dos jornadas.
+
+    Los campos numéricos se guardan como diferencias y el nombre solo si cambia.
+    Devuelve None si el equipo desapareció y un diccionario vacío si no hubo cambios.
+    """
+    if actual is None:
+        return None
+    delta = {}
+    for campo in CAMPOS_BASE:
+        if campo == "nombre":
+            if anterior is None or anterior["nombre"] != actual["nombre"]:
+                delta["nombre"] = actual["nombre"]
+        else:
+            diferencia = actual[campo] - (anterior[campo] if anterior else 0)
+            if diferencia:
+                delta[campo] = diferencia
+    return delta
+
+def _aplicar_delta(estado, id_equipo, datos):
+    """Aplica un delta serializado sobre el estado de una jornada."""
+    if datos is None:
+        estado.pop(id_equipo, None)
+        return
+    delta = json.loads(datos)
+    base = estado.get(id_equipo) or {campo: 0 for campo in CAMPOS_BASE}
+    base = dict(base)
+    for campo, valor in delta.items():
+        base[campo] = valor if campo == "nombre" else base[campo] + valor
+    estado[id_equipo] = base
+
+def _ultimo_checkpoint(cursor, jornada):
+    """Devuelve la jornada del último checkpoint anterior o igual a la dada."""
+    cursor.execute("SELECT MAX(jornada) FROM historial_jornadas WHERE checkpoint = 1 AND jornada <= ?",
+                   (jornada,))
+    return cursor.fetchone()[0]
+
+def _estado_en_jornada(cursor, jornada, id_equipo=None):
+    """Reconstruye los campos base de la clasificación en una jornada.
+
+    Parte del último checkpoint y aplica como máximo INTERVALO_CHECKPOINT - 1 jornadas de deltas.
+    """
+    checkpoint = _ultimo_checkpoint(cursor, jornada)
+    if checkpoint is None:
+        return {}
+    filtro_equipo = "" if id_equipo is None else " AND id_equipo = ?"
+    extra = () if id_equipo is None else (id_equipo,)
+    cursor.execute("SELECT id_equipo, datos FROM historial_checkpoints WHERE jornada = ?" + filtro_equipo,
+                   (checkpoint,) + extra)
+    estado = {id_eq: dict(zip(CAMPOS_BASE, json.loads(datos))) for id_eq, datos in cursor.fetchall()}
+    cursor.execute("SELECT id_equipo, datos FROM historial_deltas WHERE jornada > ? AND jornada <= ?"
+                   + filtro_equipo + " ORDER BY jornada", (checkpoint, jornada) + extra)
+    for id_eq, datos in cursor.fetchall():
+        _aplicar_delta(estado, id_eq, datos)
+    return estado
+
+def registrar_jornada(jornada=None):
+    """Registra la clasificación actual como el estado tras una jornada.
+
+    Guarda solo los cambios respecto a la jornada anterior y un checkpoint completo
+    cada INTERVALO_CHECKPOINT jornadas. Devuelve el número de jornada registrado.
+    """
+    with sqlite3.connect(DB_FILE) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MAX(jornada) FROM historial_jornadas")
+        ultima = cursor.fetchone()[0]
+        if jornada is None:
+            jornada = (ultima or 0) + 1
+        elif not isinstance(jornada, int) or jornada < 1:
+            raise ValueError("La jornada debe ser un entero positivo.")
+        elif ultima is not None and jornada <= ultima:
+            raise ValueError(f"La jornada debe ser posterior a la última registrada ({ultima}).")
+        
+        actual = {id_equipo: _base_equipo(equipo) for id_equipo, equipo in _cargar_equipos(cursor).items()}
+        checkpoint = _ultimo_checkpoint(cursor, jornada)
+        pendientes = 0
+        if checkpoint is not None:
+            cursor.execute("SELECT COUNT(*) FROM historial_jornadas WHERE jornada > ?", (checkpoint,))
+            pendientes = cursor.fetchone()[0]
+        
+        if checkpoint is None or pendientes + 1 >= INTERVALO_CHECKPOINT:
+            cursor.executemany("INSERT INTO historial_checkpoints (jornada, id_equipo, datos) VALUES (?, ?, ?)", [
+                (jornada, id_equipo, json.dumps([base[campo] for campo in CAMPOS_BASE], ensure_ascii=False))
+                for id_equipo, base in actual.items()
+            ])
+            cursor.execute("INSERT INTO historial_jornadas (jornada, checkpoint) VALUES (?, 1)", (jornada,))
+        else:
+            anterior = _estado_en_jornada(cursor, ultima)
+            deltas = []
+            for id_equipo in anterior.keys() | actual.keys():
+                delta = _delta_equipo(anterior.get(id_equipo), actual.get(id_equipo))
+                if delta is None:
+                    deltas.append((jornada, id_equipo, None))
+                elif delta:
+                    deltas.append((jornada, id_equipo, json.dumps(delta, ensure_ascii=False)))
+            cursor.executemany("INSERT INTO historial_deltas (jornada, id_equipo, datos) VALUES (?, ?, ?)", deltas)
+            cursor.execute("INSERT INTO historial_jornadas (jornada, checkpoint) VALUES (?, 0)", (jornada,))
+        conn.commit()
+    return jornada
+
+def equipos_en_jornada(jornada):
+    """Devuelve la clasificación completa tal como estaba tras una jornada."""
+    with sqlite3.connect(DB_FILE) as conn:
+        estado = _estado_en_jornada(conn.cursor(), jornada)
+    return {id_equipo: calcular_metricas(base) for id_equipo, base in estado.items()}
+
+def equipo_en_jornada(id_equipo, jornada):
+    """Devuelve los datos de un equipo tal como estaban tras una jornada."""
+    with sqlite3.connect(DB_FILE) as conn:
+        estado = _estado_en_jornada(conn.cursor(), jornada, id_equipo)
+    if id_equipo not in estado:
+        raise ValueError(f"El equipo no existía en la jornada {jornada}.")
+    return calcular_metricas(estado[id_equipo])
+
+def evolucion_ranking():
+    """Devuelve la posición de cada equipo en cada jornada registrada.
+
+    El resultado es {id_equipo: [(jornada, posicion), ...]}, ordenado por puntos,
+    diferencia de goles y goles a favor. Recorre el historial una sola vez.
+    """
+    evolucion = {}
+    with sqlite3.connect(DB_FILE) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT jornada, checkpoint FROM historial_jornadas ORDER BY jornada")
+        jornadas = cursor.fetchall()
+        estado = {}
+        for jornada, checkpoint in jornadas:
+            if checkpoint:
+                cursor.execute("SELECT id_equipo, datos FROM historial_checkpoints WHERE jornada = ?", (jornada,))
+                estado = {id_eq: dict(zip(CAMPOS_BASE, json.loads(datos))) for id_eq, datos in cursor.fetchall()}
+            else:
+                cursor.execute("SELECT id_equipo, datos FROM historial_deltas WHERE jornada = ?", (jornada,))
+                for id_eq, datos in cursor.fetchall():
+                    _aplicar_delta(estado, id_eq, datos)
+            orden = sorted(estado, key=lambda id_eq: (
+                -(estado[id_eq]["ganados"] * 3 + estado[id_eq]["empatados"]),
+                -(estado[id_eq]["goles_a_favor"] - estado[id_eq]["goles_en_contra"]),
+                -estado[id_eq]["goles_a_favor"],
+                id_eq
+            ))
+            for posicion, id_eq in enumerate(orden, 1):
+                evolucion.setdefault(id_eq, []).append((jornada, posicion))
+    return evolucion
+
+def calcular_promedios_liga(equipos_db=None):
     """Calcula el promedio de goles y puntos por partido en la liga."""
-    equipos_db = cargar_datos()
+    if equipos_db is None:
+        snapshot = abrir_snapshot()
+        if snapshot is not None:
+            agregados = snapshot.agregados()
+            return agregados["promedio_goles"], agregados["promedio_puntos"]
+        equipos_db = cargar_datos()
     if not equipos_db:
         return 0, 0
     total_goles = sum(equipo["goles_a_favor"] for equipo in equipos_db.values())
@@ -396,36 +1025,338 @@ def calcular_promedios_liga():
     promedio_puntos = total_puntos / total_partidos if total_partidos > 0 else 0
     return round(promedio_goles, 2), round(promedio_puntos, 2)
 
-def obtener_ranking():
+def obtener_ranking(equipos_db=None):
     """Obtiene los top 5 equipos por puntos totales."""
-    equipos_db = cargar_datos()
-    equipos = [(id_equipo, equipo) for id_equipo, equipo in equipos_db.items()]
-    equipos.sort(key=lambda x: x[1]["puntos_totales"], reverse=True)
-    return equipos[:5]
+    if equipos_db is not None:
+        equipos = sorted(equipos_db.items(), key=lambda x: x[1]["puntos_totales"], reverse=True)
+        return equipos[:5]
+    snapshot = abrir_snapshot()
+    if snapshot is not None:
+        return snapshot.ordenar("puntos_totales", limite=5)
+    with sqlite3.connect(DB_FILE) as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM equipos ORDER BY puntos_totales DESC, id_equipo LIMIT 5")
+        return [(row[0], _fila_a_equipo(row)) for row in cursor.fetchall()]
+
+# Métricas ordenadas por versión de datos: {"clave": (id_base_datos, version_datos), "ordenadas": {campo: array}}
+_CACHE_RANGOS = {}
+
+# Ratings por versión de datos: {"clave": (id_base_datos, version_datos), "ratings": DataFrame}
+_CACHE_RATINGS = {}
+
+def calcular_ratings(partidos_jugados, goles_a_favor, goles_en_contra, puntos_local, puntos_visitante,
+                     totales=None):
+    """Calcula la fuerza relativa a la liga de todos los equipos a la vez.
+
+    - ataque: goles a favor por partido respecto a la media de la liga (>1 es mejor).
+    - defensa: goles en contra por partido respecto a la media de la liga (<1 es mejor).
+    - factor_local: proporción de puntos obtenidos de local respecto a la de la liga.
+    Los equipos sin partidos o sin puntos quedan en el valor neutro 1.0.
+    Si se pasan los totales de la liga (sumas de CAMPOS_RATING) basta con dar los equipos
+    que se quieren evaluar; si no, las medias se calculan sobre los equipos recibidos.
+    """
+    pj = np.asarray(partidos_jugados, dtype=np.float64)
+    gf = np.asarray(goles_a_favor, dtype=np.float64)
+    gc = np.asarray(goles_en_contra, dtype=np.float64)
+    pl = np.asarray(puntos_local, dtype=np.float64)
+    pv = np.asarray(puntos_visitante, dtype=np.float64)
+    
+    if totales is None:
+        totales = (pj.sum(), gf.sum(), gc.sum(), pl.sum(), pv.sum())
+    total_partidos, total_gf, total_gc, total_pl, total_pv = totales
+    media_gf = total_gf / total_partidos if total_partidos > 0 else 0.0
+    media_gc = total_gc / total_partidos if total_partidos > 0 else 0.0
+    puntos = pl + pv
+    total_puntos = total_pl + total_pv
+    cuota_local_liga = total_pl / total_puntos if total_puntos > 0 else 0.0
+    
+    jugados = pj > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ataque = np.where(jugados & (media_gf > 0), gf / pj / media_gf, 1.0)
+        defensa = np.where(jugados & (media_gc > 0), gc / pj / media_gc, 1.0)
+        factor_local = np.where((puntos > 0) & (cuota_local_liga > 0), pl / puntos / cuota_local_liga, 1.0)
+    return {
+        "ataque": np.round(ataque, 3),
+        "defensa": np.round(defensa, 3),
+        "factor_local": np.round(factor_local, 3)
+    }
+
+def obtener_ratings():
+    """Devuelve un DataFrame con los ratings de cada equipo, indexado por id_equipo.
+
+    El resultado se reutiliza mientras no cambie la versión de los datos.
+    """
+    with sqlite3.connect(DB_FILE) as conn:
+        clave = (id_base_datos(conn), version_datos(conn))
+        if _CACHE_RATINGS.get("clave") == clave:
+            return _CACHE_RATINGS["ratings"]
+        df = pd.read_sql_query("""
+            SELECT id_equipo, partidos_jugados, goles_a_favor, goles_en_contra,
+                   puntos_local, puntos_visitante
+            FROM equipos
+        """, conn, index_col="id_equipo")
+    ratings = pd.DataFrame(calcular_ratings(df["partidos_jugados"].to_numpy(), df["goles_a_favor"].to_numpy(),
+                                            df["goles_en_contra"].to_numpy(), df["puntos_local"].to_numpy(),
+                                            df["puntos_visitante"].to_numpy()), index=df.index)
+    _CACHE_RATINGS["clave"] = clave
+    _CACHE_RATINGS["ratings"] = ratings
+    return ratings
+
+def ratings_de_equipos(equipos_db):
+    """Calcula los ratings de un diccionario de equipos ya cargado."""
+    ids = list(equipos_db)
+    columnas = [np.array([equipos_db[id_equipo][campo] for id_equipo in ids], dtype=np.float64)
+                for campo in CAMPOS_RATING]
+    return pd.DataFrame(calcular_ratings(*columnas), index=pd.Index(ids, name="id_equipo"))
+
+def calcular_elo(partidos, k=20, ventaja_local=100, rating_inicial=1500):
+    """Calcula un rating Elo a partir de una lista de partidos.
+
+    Cada partido es (jornada, id_local, id_visitante, goles_local, goles_visitante).
+    Los partidos de una misma jornada se evalúan juntos con los ratings previos a la jornada.
+    Devuelve una Series indexada por id_equipo.
+    """
+    partidos = sorted(partidos, key=lambda partido: partido[0])
+    if not partidos:
+        return pd.Series(dtype=np.float64, name="elo")
+    ids = sorted({partido[1] for partido in partidos} | {partido[2] for partido in partidos})
+    indice = {id_equipo: i for i, id_equipo in enumerate(ids)}
+    jornadas = np.array([partido[0] for partido in partidos])
+    local = np.array([indice[partido[1]] for partido in partidos])
+    visitante = np.array([indice[partido[2]] for partido in partidos])
+    resultado = np.sign(np.array([partido[3] - partido[4] for partido in partidos])) * 0.5 + 0.5
+    
+    ratings = np.full(len(ids), float(rating_inicial))
+    for bloque in np.split(np.arange(len(partidos)), np.flatnonzero(np.diff(jornadas)) + 1):
+        l, v = local[bloque], visitante[bloque]
+        esperado = 1.0 / (1.0 + 10.0 ** ((ratings[v] - ratings[l] - ventaja_local) / 400.0))
+        cambio = k * (resultado[bloque] - esperado)
+        np.add.at(ratings, l, cambio)
+        np.add.at(ratings, v, -cambio)
+    return pd.Series(np.round(ratings, 1), index=ids, name="elo")
+
+def generar_calendario(ids):
+    """Genera un calendario de liga a doble vuelta con el método del círculo.
+
+    Devuelve una lista de jornadas, cada una con pares (id_local, id_visitante).
+    """
+    equipos = list(ids)
+    if len(equipos) % 2:
+        equipos.append(None)
+    n = len(equipos)
+    ida = []
+    for ronda in range(n - 1):
+        jornada = []
+        for i in range(n // 2):
+            local, visitante = equipos[i], equipos[n - 1 - i]
+            if ronda % 2:
+                local, visitante = visitante, local
+            if local is not None and visitante is not None:
+                jornada.append((local, visitante))
+        ida.append(jornada)
+        equipos.insert(1, equipos.pop())
+    vuelta = [[(visitante, local) for local, visitante in jornada] for jornada in ida]
+    return ida + vuelta
+
+def _simular_lote(args):
+    """Simula un lote de temporadas y devuelve el histograma de posiciones y los puntos sumados."""
+    semilla, n_temporadas, puntos, diferencia, goles, local, visitante, mu_local, mu_visitante = args
+    rng = np.random.default_rng(semilla)
+    n_equipos = len(puntos)
+    goles_local = rng.poisson(mu_local, size=(n_temporadas, len(local)))
+    goles_visitante = rng.poisson(mu_visitante, size=(n_temporadas, len(visitante)))
+    
+    # Matrices de incidencia partido -> equipo para acumular con productos matriciales
+    incidencia_local = np.zeros((len(local), n_equipos))
+    incidencia_local[np.arange(len(local)), local] = 1
+    incidencia_visitante = np.zeros((len(visitante), n_equipos))
+    incidencia_visitante[np.arange(len(visitante)), visitante] = 1
+    
+    margen = goles_local - goles_visitante
+    puntos_local = np.where(margen > 0, 3, np.where(margen == 0, 1, 0))
+    puntos_visitante = np.where(margen < 0, 3, np.where(margen == 0, 1, 0))
+    puntos_sim = puntos + puntos_local @ incidencia_local + puntos_visitante @ incidencia_visitante
+    diferencia_sim = diferencia + margen @ incidencia_local - margen @ incidencia_visitante
+    goles_sim = goles + goles_local @ incidencia_local + goles_visitante @ incidencia_visitante
+    
+    # Orden por puntos, diferencia de goles, goles a favor y sorteo
+    clave = puntos_sim + diferencia_sim * 1e-4 + goles_sim * 1e-8 + rng.random(puntos_sim.shape) * 1e-9
+    orden = np.argsort(-clave, axis=1)
+    posiciones = np.empty_like(orden)
+    np.put_along_axis(posiciones, orden, np.arange(n_equipos)[None, :].repeat(n_temporadas, axis=0), axis=1)
+    histograma = np.zeros((n_equipos, n_equipos), dtype=np.int64)
+    np.add.at(histograma, (np.broadcast_to(np.arange(n_equipos), posiciones.shape), posiciones), 1)
+    return histograma, puntos_sim.sum(axis=0)
+
+def simular_temporada(n_temporadas=10000, semilla=None, procesos=None, calendario=None):
+    """Proyecta la clasificación final simulando el resto de la temporada con Monte Carlo.
+
+    Los goles de cada partido se extraen de distribuciones de Poisson cuyas medias salen
+    de la fuerza de ataque y defensa de cada equipo y de su rendimiento de local o visitante.
+    Si no se indica calendario (lista de pares (id_local, id_visitante) pendientes) se usan
+    las jornadas restantes de una liga a doble vuelta. Los lotes de SIMULACIONES_POR_LOTE
+    temporadas se reparten en un pool de procesos; con la misma semilla el resultado es idéntico.
+    El DataFrame resultante incluye el nombre de cada equipo.
+    """
+    if not isinstance(n_temporadas, int) or n_temporadas < 1:
+        raise ValueError("El número de temporadas debe ser un entero positivo.")
+    equipos_db = leer_equipos()
+    if not equipos_db:
+        raise ValueError("No hay equipos para simular.")
+    ids = list(equipos_db)
+    indice = {id_equipo: i for i, id_equipo in enumerate(ids)}
+    columnas = {campo: np.array([equipos_db[id_equipo][campo] for id_equipo in ids], dtype=np.float64)
+                for campo in ("partidos_jugados", "goles_a_favor", "goles_en_contra", "puntos_totales",
+                              "puntos_local", "puntos_visitante", "diferencia_goles")}
+    ratings = calcular_ratings(columnas["partidos_jugados"], columnas["goles_a_favor"],
+                               columnas["goles_en_contra"], columnas["puntos_local"],
+                               columnas["puntos_visitante"])
+    
+    if calendario is None:
+        jornadas = generar_calendario(ids)
+        jugadas = int(np.median(columnas["partidos_jugados"]))
+        calendario = [partido for jornada in jornadas[jugadas:] for partido in jornada]
+    try:
+        local = np.array([indice[id_local] for id_local, _ in calendario], dtype=np.int64)
+        visitante = np.array([indice[id_visitante] for _, id_visitante in calendario], dtype=np.int64)
+    except KeyError as e:
+        raise ValueError(f"El equipo {e} del calendario no existe.")
+    
+    total_partidos = columnas["partidos_jugados"].sum()
+    media_goles = columnas["goles_a_favor"].sum() / total_partidos if total_partidos > 0 else 0.0
+    # Reparto local/visitante de los puntos de cada equipo respecto al de la liga
+    factor_local = ratings["factor_local"]
+    puntos = columnas["puntos_local"] + columnas["puntos_visitante"]
+    total_puntos = puntos.sum()
+    cuota_visitante_liga = columnas["puntos_visitante"].sum() / total_puntos if total_puntos > 0 else 0.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor_visitante = np.where((puntos > 0) & (cuota_visitante_liga > 0),
+                                    columnas["puntos_visitante"] / puntos / cuota_visitante_liga, 1.0)
+    mu_local = media_goles * ratings["ataque"][local] * ratings["defensa"][visitante] * factor_local[local]
+    mu_visitante = (media_goles * ratings["ataque"][visitante] * ratings["defensa"][local]
+                    * factor_visitante[visitante])
+    
+    tamanos = [SIMULACIONES_POR_LOTE] * (n_temporadas // SIMULACIONES_POR_LOTE)
+    if n_temporadas % SIMULACIONES_POR_LOTE:
+        tamanos.append(n_temporadas % SIMULACIONES_POR_LOTE)
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    lotes = [(semilla_lote, tamano, columnas["puntos_totales"], columnas["diferencia_goles"],
+              columnas["goles_a_favor"], local, visitante, mu_local, mu_visitante)
+             for semilla_lote, tamano in zip(semillas, tamanos)]
+    if procesos == 1 or len(lotes) == 1:
+        resultados = list(map(_simular_lote, lotes))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_simular_lote, lotes))
+    
+    histograma = sum(resultado[0] for resultado in resultados)
+    puntos_sumados = sum(resultado[1] for resultado in resultados)
+    n_equipos = len(ids)
+    probabilidades = histograma / n_temporadas
+    return pd.DataFrame({
+        "nombre": [equipos_db[id_equipo]["nombre"] for id_equipo in ids],
+        "puntos_esperados": np.round(puntos_sumados / n_temporadas, 1),
+        "prob_campeon": probabilidades[:, 0].round(4),
+        "prob_clasificacion": probabilidades[:, :PLAZAS_CLASIFICACION].sum(axis=1).round(4),
+        "prob_descenso": probabilidades[:, max(0, n_equipos - PLAZAS_DESCENSO):].sum(axis=1).round(4)
+    }, index=pd.Index(ids, name="id_equipo")).sort_values("puntos_esperados", ascending=False)
+
+def _metricas_ordenadas(snapshot):
+    """Devuelve {campo: valores ordenados} de las métricas con rango, calculados una vez por versión."""
+    clave = (snapshot.id_base_datos, snapshot.version)
+    if _CACHE_RANGOS.get("clave") != clave:
+        _CACHE_RANGOS["ordenadas"] = {campo: np.sort(snapshot.columnas[campo]) for campo in METRICAS_RANGO}
+        _CACHE_RANGOS["clave"] = clave
+    return _CACHE_RANGOS["ordenadas"]
+
+def _posicion(ordenados, valor, mayor_es_mejor):
+    """Devuelve 1 más el número de valores mejores que el dado en una columna ordenada."""
+    if mayor_es_mejor:
+        return len(ordenados) - int(np.searchsorted(ordenados, valor, side="right")) + 1
+    return int(np.searchsorted(ordenados, valor, side="left")) + 1
+
+def obtener_rangos(id_equipo):
+    """Devuelve {metrica: (posicion, total, percentil)} de un equipo en la liga.
+
+    Cada métrica del snapshot se ordena con NumPy una vez por versión de datos y la posición
+    se busca después con búsqueda binaria. Los empatados comparten posición, como RANK, y el
+    percentil sale de la misma ordenación: 100 para el primero y 0 para el último. Sin
+    snapshot se cuentan los equipos mejores con una sola lectura de SQLite.
+    """
+    snapshot = abrir_snapshot()
+    if snapshot is not None:
+        equipo = snapshot.buscar(id_equipo)
+        total = len(snapshot)
+        ordenadas = _metricas_ordenadas(snapshot)
+        posiciones = {campo: _posicion(ordenadas[campo], equipo[campo], mayor_es_mejor)
+                      for campo, (_, mayor_es_mejor) in METRICAS_RANGO.items()}
+    else:
+        equipo = leer_equipo(id_equipo)
+        conteos = ", ".join(f"COALESCE(SUM(COALESCE({campo}, 0) {'>' if mayor_es_mejor else '<'} ?), 0)"
+                            for campo, (_, mayor_es_mejor) in METRICAS_RANGO.items())
+        with sqlite3.connect(DB_FILE) as conn:
+            total, *mejores = conn.execute(f"SELECT COUNT(*), {conteos} FROM equipos",
+                                           [equipo[campo] for campo in METRICAS_RANGO]).fetchone()
+        posiciones = {campo: mejores[i] + 1 for i, campo in enumerate(METRICAS_RANGO)}
+    return {campo: (posicion, total, round(100.0 * (total - posicion) / (total - 1), 1) if total > 1 else 100.0)
+            for campo, posicion in posiciones.items()}
+
+def totales_liga():
+    """Devuelve la suma de cada campo de CAMPOS_RATING en toda la liga."""
+    snapshot = abrir_snapshot()
+    if snapshot is not None:
+        return snapshot.sumar(CAMPOS_RATING)
+    sumas = ", ".join(f"COALESCE(SUM({campo}), 0)" for campo in CAMPOS_RATING)
+    with sqlite3.connect(DB_FILE) as conn:
+        return list(conn.execute(f"SELECT {sumas} FROM equipos").fetchone())
 
 def mostrar_estadisticas_equipo(id_equipo):
     """Devuelve las estadísticas de un equipo como cadena formateada."""
     equipo = leer_equipo(id_equipo)
+    rangos = obtener_rangos(id_equipo)
     promedio_goles, promedio_puntos = calcular_promedios_liga()
-    stats_df = pd.DataFrame({
-        "Métrica": ["Partidos jugados", "Ganados", "Empatados", "Perdidos", 
-                    "Goles a favor", "Goles en contra", "Puntos totales", 
-                    "Puntos de local", "Puntos de visitante", "Diferencia de goles",
-                    "Porcentaje de victorias (%)", "Goles por partido",
-                    "Promedio de goles en la liga", "Promedio de puntos por partido"],
-        "Valor": [equipo["partidos_jugados"], equipo["ganados"], equipo["empatados"], 
-                  equipo["perdidos"], equipo["goles_a_favor"], equipo["goles_en_contra"], 
-                  equipo["puntos_totales"], equipo["puntos_local"], equipo["puntos_visitante"],
-                  equipo["diferencia_goles"], equipo["porcentaje_victorias"], 
-                  equipo["goles_por_partido"], promedio_goles, promedio_puntos]
-    })
-    return f"Estadísticas de {equipo['nombre']}:\n{stats_df.to_string(index=False)}"
+    ratings = calcular_ratings(*([equipo[campo]] for campo in CAMPOS_RATING), totales=totales_liga())
+    rating = {campo: valores[0] for campo, valores in ratings.items()}
+    
+    lineas = []
+    for campo, etiqueta in [("partidos_jugados", "Partidos jugados"), ("ganados", "Ganados"),
+                            ("empatados", "Empatados"), ("perdidos", "Perdidos")]:
+        lineas.append((etiqueta, equipo[campo]))
+    for campo, (etiqueta, _) in METRICAS_RANGO.items():
+        posicion, total, percentil = rangos[campo]
+        lineas.append((etiqueta, f"{equipo[campo]}  ({posicion}º de {total}, percentil {percentil:.0f})"))
+    lineas += [
+        ("Promedio de goles en la liga", promedio_goles),
+        ("Promedio de puntos por partido", promedio_puntos),
+        ("Fuerza de ataque", rating["ataque"]),
+        ("Fuerza defensiva (goles encajados)", rating["defensa"]),
+        ("Factor local", rating["factor_local"])
+    ]
+    ancho = max(len(etiqueta) for etiqueta, _ in lineas)
+    texto = "\n".join(f"{etiqueta.rjust(ancho)}  {valor}" for etiqueta, valor in lineas)
+    return f"Estadísticas de {equipo['nombre']}:\n{texto}"
 
-def graficar_estadisticas():
-    """Genera gráficos interactivos con plotly."""
-    equipos_db = cargar_datos()
+def _guardar_grafico(fig, nombre):
+    """Guarda un gráfico como HTML (con plotly.js compartido en el directorio) y PNG."""
+    fig.write_html(f"{nombre}.html", include_plotlyjs="directory")
+    fig.write_image(f"{nombre}.png", width=800, height=600)
+    return f"{nombre}.html"
+
+def graficar_estadisticas(modo=None, equipos_db=None):
+    """Genera gráficos interactivos con plotly.
+
+    Con modo="grande" (o automáticamente a partir de UMBRAL_LIGA_GRANDE equipos) se usan
+    gráficos agregados cuyo tamaño no crece con el número de equipos.
+    Devuelve la lista de archivos HTML generados.
+    """
+    if equipos_db is None:
+        equipos_db = leer_equipos()
     if not equipos_db:
         raise ValueError("No hay equipos para graficar.")
+    if modo is None:
+        modo = "grande" if len(equipos_db) > UMBRAL_LIGA_GRANDE else "normal"
+    if modo == "grande":
+        return _graficar_liga_grande(equipos_db)
     
     nombres = [equipo["nombre"] for equipo in equipos_db.values()]
     puntos_totales = [equipo["puntos_totales"] for equipo in equipos_db.values()]
@@ -434,13 +1365,13 @@ def graficar_estadisticas():
     puntos_local = [equipo["puntos_local"] for equipo in equipos_db.values()]
     puntos_visitante = [equipo["puntos_visitante"] for equipo in equipos_db.values()]
     porcentaje_victorias = [equipo["porcentaje_victorias"] for equipo in equipos_db.values()]
+    archivos = []
     
     fig = px.bar(x=nombres, y=puntos_totales, title="Puntos Totales por Equipo",
                  labels={"x": "Equipos", "y": "Puntos totales"}, color=puntos_totales,
                  color_continuous_scale="Blues")
     fig.update_layout(xaxis_tickangle=45)
-    fig.write_html("puntos_totales.html")
-    fig.write_image("puntos_totales.png", width=800, height=600)
+    archivos.append(_guardar_grafico(fig, "puntos_totales"))
     
     df_goles = pd.DataFrame({
         "Equipo": nombres * 2,
@@ -452,8 +1383,7 @@ def graficar_estadisticas():
                  labels={"Goles": "Goles", "Equipo": "Equipos"},
                  color_discrete_map={"A favor": "green", "En contra": "red"})
     fig.update_layout(xaxis_tickangle=45)
-    fig.write_html("goles.html")
-    fig.write_image("goles.png", width=800, height=600)
+    archivos.append(_guardar_grafico(fig, "goles"))
     
     df_puntos = pd.DataFrame({
         "Equipo": nombres * 2,
@@ -465,19 +1395,92 @@ def graficar_estadisticas():
                  labels={"Puntos": "Puntos", "Equipo": "Equipos"},
                  color_discrete_map={"Local": "blue", "Visitante": "orange"})
     fig.update_layout(xaxis_tickangle=45)
-    fig.write_html("puntos_local_visitante.html")
-    fig.write_image("puntos_local_visitante.png", width=800, height=600)
+    archivos.append(_guardar_grafico(fig, "puntos_local_visitante"))
     
     fig = px.bar(x=nombres, y=porcentaje_victorias, title="Porcentaje de Victorias por Equipo",
                  labels={"x": "Equipos", "y": "Porcentaje de victorias (%)"},
                  color=porcentaje_victorias, color_continuous_scale="Purples")
     fig.update_layout(xaxis_tickangle=45)
-    fig.write_html("porcentaje_victorias.html")
-    fig.write_image("porcentaje_victorias.png", width=800, height=600)
+    archivos.append(_guardar_grafico(fig, "porcentaje_victorias"))
+    return archivos
+
+def _top_n_con_otros(df, columnas, orden):
+    """Devuelve los TOP_N_GRAFICOS equipos según una columna y una fila "Otros" con la media del resto."""
+    top = df.nlargest(TOP_N_GRAFICOS, orden)
+    resto = df.drop(top.index)
+    filas = top[["nombre"] + columnas]
+    if len(resto):
+        otros = pd.DataFrame([{"nombre": f"Otros ({len(resto)}, media)",
+                               **{columna: round(resto[columna].mean(), 2) for columna in columnas}}])
+        filas = pd.concat([filas, otros], ignore_index=True)
+    return filas
 
-def generar_informe_pdf(lang="es"):
+def _histograma(valores, titulo, etiqueta, color):
+    """Crea un histograma con los intervalos ya calculados, sin incrustar los datos originales."""
+    conteos, bordes = np.histogram(valores, bins=BINS_HISTOGRAMA)
+    centros = (bordes[:-1] + bordes[1:]) / 2
+    fig = go.Figure(go.Bar(x=centros, y=conteos, width=np.diff(bordes), marker_color=color))
+    fig.update_layout(title=titulo, xaxis_title=etiqueta, yaxis_title="Equipos", bargap=0)
+    return fig
+
+def _graficar_liga_grande(equipos_db):
+    """Genera los gráficos agregados para ligas con muchos equipos."""
+    df = pd.DataFrame.from_dict(equipos_db, orient="index")
+    archivos = []
+    
+    top = _top_n_con_otros(df, ["puntos_totales"], "puntos_totales")
+    fig = px.bar(top, x="nombre", y="puntos_totales",
+                 title=f"Puntos Totales: Top {TOP_N_GRAFICOS} y resto",
+                 labels={"nombre": "Equipos", "puntos_totales": "Puntos totales"},
+                 color="puntos_totales", color_continuous_scale="Blues")
+    fig.update_layout(xaxis_tickangle=45)
+    archivos.append(_guardar_grafico(fig, "puntos_totales"))
+    
+    top = _top_n_con_otros(df, ["goles_a_favor", "goles_en_contra"], "goles_a_favor")
+    fig = px.bar(top, x="nombre", y=["goles_a_favor", "goles_en_contra"], barmode="group",
+                 title=f"Goles a Favor y en Contra: Top {TOP_N_GRAFICOS} y resto",
+                 labels={"nombre": "Equipos", "value": "Goles", "variable": "Tipo"},
+                 color_discrete_map={"goles_a_favor": "green", "goles_en_contra": "red"})
+    fig.update_layout(xaxis_tickangle=45)
+    archivos.append(_guardar_grafico(fig, "goles"))
+    
+    top = _top_n_con_otros(df, ["puntos_totales", "puntos_local", "puntos_visitante"], "puntos_totales")
+    fig = px.bar(top, x="nombre", y=["puntos_local", "puntos_visitante"], barmode="group",
+                 title=f"Puntos de Local vs Visitante: Top {TOP_N_GRAFICOS} y resto",
+                 labels={"nombre": "Equipos", "value": "Puntos", "variable": "Tipo"},
+                 color_discrete_map={"puntos_local": "blue", "puntos_visitante": "orange"})
+    fig.update_layout(xaxis_tickangle=45)
+    archivos.append(_guardar_grafico(fig, "puntos_local_visitante"))
+    
+    fig = _histograma(df["porcentaje_victorias"], "Distribución del Porcentaje de Victorias",
+                      "Porcentaje de victorias (%)", "purple")
+    archivos.append(_guardar_grafico(fig, "porcentaje_victorias"))
+    
+    fig = _histograma(df["puntos_totales"], "Distribución de Puntos Totales", "Puntos totales", "steelblue")
+    archivos.append(_guardar_grafico(fig, "puntos_histograma"))
+    
+    fig = _histograma(df["diferencia_goles"], "Distribución de la Diferencia de Goles",
+                      "Diferencia de goles", "teal")
+    archivos.append(_guardar_grafico(fig, "diferencia_goles"))
+    
+    # Dispersión con WebGL; por encima de MAX_PUNTOS_DISPERSION se muestra la densidad
+    if len(df) <= MAX_PUNTOS_DISPERSION:
+        fig = go.Figure(go.Scattergl(x=df["goles_a_favor"], y=df["goles_en_contra"], mode="markers",
+                                     text=df["nombre"], marker=dict(size=4, opacity=0.6)))
+    else:
+        densidad, bordes_x, bordes_y = np.histogram2d(df["goles_a_favor"], df["goles_en_contra"],
+                                                      bins=BINS_HISTOGRAMA)
+        fig = go.Figure(go.Heatmap(x=(bordes_x[:-1] + bordes_x[1:]) / 2, y=(bordes_y[:-1] + bordes_y[1:]) / 2,
+                                   z=densidad.T, colorscale="Viridis"))
+    fig.update_layout(title="Goles a Favor vs Goles en Contra", xaxis_title="Goles a favor",
+                      yaxis_title="Goles en contra")
+    archivos.append(_guardar_grafico(fig, "goles_dispersion"))
+    return archivos
+
+def generar_informe_pdf(lang="es", equipos_db=None):
     """Genera un informe PDF con las estadísticas, gráficos y ranking."""
-    equipos_db = cargar_datos()
+    if equipos_db is None:
+        equipos_db = leer_equipos()
     pdf_file = f"informe_estadisticas_futbol_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
     doc = SimpleDocTemplate(pdf_file, pagesize=letter)
     elements = []
@@ -486,10 +1489,11 @@ def generar_informe_pdf(lang="es"):
     elements.append(Paragraph(TRADUCCIONES[lang]["title"], styles['Title']))
     elements.append(Spacer(1, 12))
     
-    promedio_goles, promedio_puntos = calcular_promedios_liga()
+    promedio_goles, promedio_puntos = calcular_promedios_liga(equipos_db)
+    ratings = ratings_de_equipos(equipos_db)
     data = [["Nombre", "Partidos", "Puntos", "Goles a favor", "Goles en contra", 
              "Puntos local", "Puntos visitante", "Diferencia goles", 
-             "Porcentaje victorias", "Goles por partido"]]
+             "Porcentaje victorias", "Goles por partido", "Ataque", "Defensa"]]
     for id_equipo, equipo in equipos_db.items():
         data.append([
             equipo["nombre"],
@@ -501,7 +1505,9 @@ def generar_informe_pdf(lang="es"):
             str(equipo["puntos_visitante"]),
             str(equipo["diferencia_goles"]),
             str(equipo["porcentaje_victorias"]),
-            str(equipo["goles_por_partido"])
+            str(equipo["goles_por_partido"]),
+            str(ratings.at[id_equipo, "ataque"]),
+            str(ratings.at[id_equipo, "defensa"])
         ])
     
     table = Table(data)
@@ -523,7 +1529,7 @@ def generar_informe_pdf(lang="es"):
     
     elements.append(Spacer(1, 12))
     elements.append(Paragraph(TRADUCCIONES[lang]["ranking"], styles['Heading2']))
-    ranking = obtener_ranking()
+    ranking = obtener_ranking(equipos_db)
     ranking_data = [["Posición", "Nombre", "Puntos"]]
     for i, (id_equipo, equipo) in enumerate(ranking, 1):
         ranking_data.append([str(i), equipo["nombre"], str(equipo["puntos_totales"])])
@@ -551,10 +1557,381 @@ def generar_informe_pdf(lang="es"):
     doc.build(elements)
     return pdf_file
 
+def ruta_snapshot():
+    """Devuelve la ruta del snapshot binario asociado a la base de datos."""
+    return os.path.splitext(DB_FILE)[0] + ".snap"
+
+def _disposicion_snapshot(n_equipos, ancho_id, ancho_nombre):
+    """Devuelve [(campo, dtype, offset)] de las columnas del snapshot y el tamaño total del archivo."""
+    disposicion = []
+    offset = TAMANO_CABECERA_SNAPSHOT
+    for campo, dtype in [("id_equipo", f"S{ancho_id}"), ("nombre", f"S{ancho_nombre}")] + list(COLUMNAS_SNAPSHOT):
+        dtype = np.dtype(dtype)
+        disposicion.append((campo, dtype, offset))
+        offset = (offset + n_equipos * dtype.itemsize + 7) // 8 * 8
+    return disposicion, offset
+
+def _columnas_consulta_snapshot():
+    """Devuelve la lista de columnas del SELECT con el que se leen las filas del snapshot."""
+    campos = ", ".join(f"COALESCE({campo}, 0)" for campo, _ in COLUMNAS_SNAPSHOT)
+    return f"CAST(id_equipo AS BLOB), CAST(COALESCE(nombre, '') AS BLOB), {campos}"
+
+def _crear_archivo_snapshot(ruta, identificador, version, n_equipos, ancho_id, ancho_nombre):
+    """Crea el archivo de un snapshot con su cabecera y devuelve sus columnas mapeadas para escritura."""
+    disposicion, tamano = _disposicion_snapshot(n_equipos, ancho_id, ancho_nombre)
+    with open(ruta, 'wb') as file:
+        file.write(CABECERA_SNAPSHOT.pack(MAGIA_SNAPSHOT, FORMATO_SNAPSHOT, identificador, version,
+                                          n_equipos, ancho_id, ancho_nombre)
+                   .ljust(TAMANO_CABECERA_SNAPSHOT, b"\0"))
+        file.truncate(tamano)
+    if not n_equipos:
+        return []
+    return [np.memmap(ruta, dtype=dtype, mode="r+", offset=offset, shape=(n_equipos,))
+            for _, dtype, offset in disposicion]
+
+def escribir_snapshot():
+    """Escribe de forma atómica un snapshot columnar de ancho fijo de la tabla equipos.
+
+    Los equipos se guardan ordenados por id_equipo. El archivo se construye en un temporal
+    y se renombra al final, así los lectores nunca ven un snapshot a medio escribir.
+    """
+    ruta = ruta_snapshot()
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        with sqlite3.connect(DB_FILE) as conn:
+            conn.execute("BEGIN")
+            identificador = id_base_datos(conn)
+            version = version_datos(conn)
+            n_equipos, ancho_id, ancho_nombre = conn.execute("""
+                SELECT COUNT(*), COALESCE(MAX(LENGTH(CAST(id_equipo AS BLOB))), 0),
+                       COALESCE(MAX(LENGTH(CAST(nombre AS BLOB))), 0)
+                FROM equipos
+            """).fetchone()
+            columnas = _crear_archivo_snapshot(temporal, identificador, version, n_equipos,
+                                               max(1, ancho_id), max(1, ancho_nombre))
+            if columnas:
+                cursor = conn.execute(f"SELECT {_columnas_consulta_snapshot()} FROM equipos ORDER BY id_equipo")
+                inicio = 0
+                while True:
+                    filas = cursor.fetchmany(FILAS_POR_BLOQUE_SNAPSHOT)
+                    if not filas:
+                        break
+                    fin = inicio + len(filas)
+                    for columna, valores in zip(columnas, zip(*filas)):
+                        columna[inicio:fin] = valores
+                    inicio = fin
+                for columna in columnas:
+                    columna.flush()
+            del columnas
+            conn.commit()
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return ruta
+
+def _filas_snapshot(conn, ids):
+    """Lee, ordenadas por ID, las filas en formato de snapshot de los equipos indicados que existen."""
+    consulta = f"SELECT {_columnas_consulta_snapshot()} FROM equipos WHERE id_equipo = ?"
+    filas = [conn.execute(consulta, (id_equipo,)).fetchone() for id_equipo in sorted(ids)]
+    return [fila for fila in filas if fila is not None]
+
+def _parchear_snapshot(identificador, anterior, version, ids, filas):
+    """Reescribe el snapshot sustituyendo solo los equipos indicados, sin volver a leer SQLite.
+
+    ids son los equipos escritos o eliminados y filas las filas actuales de los que siguen
+    existiendo. El resto de cada columna se copia con NumPy del snapshot guardado, que debe
+    corresponder a la versión anterior; si no es así devuelve False y no escribe nada.
+    """
+    ruta = ruta_snapshot()
+    try:
+        base = SnapshotEquipos(ruta)
+    except (OSError, ValueError):
+        return False
+    if (base.id_base_datos, base.version) != (identificador, anterior):
+        return False
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        ids_base = base.columnas["id_equipo"]
+        claves = np.array([id_equipo.encode("utf-8") for id_equipo in ids], dtype=bytes)
+        conservar = np.flatnonzero(~np.isin(ids_base, claves))
+        nuevas = list(zip(*filas)) or [()] * (2 + len(COLUMNAS_SNAPSHOT))
+        ancho_id = max([ids_base.itemsize] + [len(valor) for valor in nuevas[0]])
+        ancho_nombre = max([base.columnas["nombre"].itemsize] + [len(valor) for valor in nuevas[1]])
+        posiciones = np.searchsorted(ids_base[conservar], np.array(nuevas[0], dtype=bytes))
+        columnas = _crear_archivo_snapshot(temporal, identificador, version, len(conservar) + len(filas),
+                                           ancho_id, ancho_nombre)
+        campos = ["id_equipo", "nombre"] + [campo for campo, _ in COLUMNAS_SNAPSHOT]
+        for columna, campo, valores in zip(columnas, campos, nuevas):
+            columna[:] = np.insert(base.columnas[campo][conservar].astype(columna.dtype), posiciones,
+                                   np.array(valores, dtype=columna.dtype))
+            columna.flush()
+        del columnas
+        # Se liberan los mapeos antes de reemplazar el archivo (Windows no permite sustituirlo abierto)
+        del base, ids_base
+        os.replace(temporal, ruta)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return True
+
+def actualizar_snapshot(identificador, anterior, version, ids, filas):
+    """Lleva al snapshot una escritura ya confirmada que pasó de la versión anterior a version.
+
+    Con filas (escrituras pequeñas) se parchean solo esos equipos; con filas None, o si el
+    snapshot guardado no es el de la versión anterior, se reescribe completo. Los errores no
+    se propagan porque los datos ya están guardados: el snapshot queda desactualizado y
+    abrir_snapshot lo rehará o los lectores usarán SQLite.
+    """
+    if version == anterior:
+        return
+    try:
+        if filas is None or not _parchear_snapshot(identificador, anterior, version, ids, filas):
+            escribir_snapshot()
+    except (OSError, sqlite3.Error):
+        pass
+
+def _minusculas(columna):
+    """Pasa a minúsculas una columna de texto UTF-8 de ancho fijo sin decodificarla entera.
+
+    Las filas solo ASCII se convierten con NumPy; las que tienen otros caracteres, con str.lower.
+    """
+    minusculas = np.char.lower(columna)
+    if len(columna):
+        no_ascii = np.flatnonzero((columna.view(np.uint8).reshape(len(columna), -1) >= 0x80).any(axis=1))
+        if len(no_ascii):
+            convertidas = [valor.decode("utf-8").lower().encode("utf-8") for valor in columna[no_ascii].tolist()]
+            minusculas = minusculas.astype(f"S{max([minusculas.itemsize] + [len(valor) for valor in convertidas])}")
+            minusculas[no_ascii] = convertidas
+    return minusculas
+
+# Columnas de texto en minúsculas para la búsqueda: {"clave": (id_base_datos, version), "textos": [ids, nombres]}
+_CACHE_BUSQUEDA = {}
+
+class SnapshotEquipos:
+    """Vista de solo lectura, mapeada en memoria, de un snapshot de equipos."""
+    
+    def __init__(self, ruta):
+        with open(ruta, 'rb') as file:
+            cabecera = file.read(CABECERA_SNAPSHOT.size)
+        if len(cabecera) < CABECERA_SNAPSHOT.size:
+            raise ValueError("El snapshot está dañado.")
+        (magia, formato, self.id_base_datos, self.version, self.n_equipos,
+         ancho_id, ancho_nombre) = CABECERA_SNAPSHOT.unpack(cabecera)
+        if magia != MAGIA_SNAPSHOT or formato != FORMATO_SNAPSHOT:
+            raise ValueError("El formato del snapshot no es compatible.")
+        disposicion, tamano = _disposicion_snapshot(self.n_equipos, ancho_id, ancho_nombre)
+        if os.path.getsize(ruta) < tamano:
+            raise ValueError("El snapshot está truncado.")
+        self.columnas = {}
+        for campo, dtype, offset in disposicion:
+            if self.n_equipos:
+                self.columnas[campo] = np.memmap(ruta, dtype=dtype, mode="r", offset=offset, shape=(self.n_equipos,))
+            else:
+                self.columnas[campo] = np.empty(0, dtype=dtype)
+    
+    @classmethod
+    def desde_equipos(cls, equipos_db):
+        """Construye en memoria, sin archivo, un snapshot con los equipos de un diccionario."""
+        snapshot = cls.__new__(cls)
+        snapshot.id_base_datos = snapshot.version = None
+        ids = sorted(equipos_db)
+        snapshot.n_equipos = len(ids)
+        snapshot.columnas = {
+            "id_equipo": np.array([id_equipo.encode("utf-8") for id_equipo in ids], dtype=bytes),
+            "nombre": np.array([equipos_db[id_equipo]["nombre"].encode("utf-8") for id_equipo in ids], dtype=bytes)
+        }
+        for campo, dtype in COLUMNAS_SNAPSHOT:
+            snapshot.columnas[campo] = np.array([equipos_db[id_equipo][campo] for id_equipo in ids], dtype=dtype)
+        return snapshot
+    
+    def __len__(self):
+        return self.n_equipos
+    
+    def _equipo(self, i):
+        """Construye el diccionario de datos del equipo en la posición i."""
+        equipo = {"nombre": self.columnas["nombre"][i].decode("utf-8")}
+        for campo, dtype in COLUMNAS_SNAPSHOT:
+            valor = self.columnas[campo][i]
+            equipo[campo] = float(valor) if dtype == "<f8" else int(valor)
+        return equipo
+    
+    def buscar(self, id_equipo):
+        """Busca un equipo por ID con búsqueda binaria."""
+        ids = self.columnas["id_equipo"]
+        clave = id_equipo.encode("utf-8")
+        i = int(np.searchsorted(ids, clave))
+        if i >= self.n_equipos or ids[i] != clave:
+            raise ValueError("El equipo no existe.")
+        return self._equipo(i)
+    
+    def ordenar(self, campo, descendente=True, limite=None):
+        """Devuelve [(id_equipo, datos)] ordenados por una columna numérica, opcionalmente solo los primeros."""
+        valores = self.columnas[campo]
+        clave = -valores if descendente else valores
+        if limite is not None and limite < self.n_equipos:
+            candidatos = np.argpartition(clave, limite)[:limite]
+            indices = candidatos[np.argsort(clave[candidatos], kind="stable")]
+        else:
+            indices = np.argsort(clave, kind="stable")
+        return self.filas(indices)
+    
+    def filas(self, indices):
+        """Devuelve [(id_equipo, datos)] de los equipos en las posiciones dadas."""
+        ids = self.columnas["id_equipo"]
+        return [(ids[i].decode("utf-8"), self._equipo(i)) for i in indices]
+    
+    def filtrar(self, texto):
+        """Devuelve, en orden de ID, las posiciones de los equipos cuyo ID o nombre contiene el texto.
+
+        No distingue mayúsculas. Las columnas de texto en minúsculas se guardan en caché para
+        la versión del snapshot, así cada pulsación del buscador es solo una búsqueda de NumPy.
+        """
+        if not texto:
+            return np.arange(self.n_equipos)
+        clave = (self.id_base_datos, self.version)
+        if self.version is not None and _CACHE_BUSQUEDA.get("clave") == clave:
+            textos = _CACHE_BUSQUEDA["textos"]
+        else:
+            textos = [_minusculas(self.columnas[campo]) for campo in ("id_equipo", "nombre")]
+            if self.version is not None:
+                _CACHE_BUSQUEDA.update(clave=clave, textos=textos)
+        texto = texto.lower().encode("utf-8")
+        return np.flatnonzero((np.char.find(textos[0], texto) >= 0) | (np.char.find(textos[1], texto) >= 0))
+    
+    def equipos(self):
+        """Devuelve {id_equipo: datos} de todos los equipos, ordenados por ID."""
+        campos = ["nombre"] + [campo for campo, _ in COLUMNAS_SNAPSHOT]
+        ids = [id_equipo.decode("utf-8") for id_equipo in self.columnas["id_equipo"].tolist()]
+        nombres = [nombre.decode("utf-8") for nombre in self.columnas["nombre"].tolist()]
+        columnas = [self.columnas[campo].tolist() for campo, _ in COLUMNAS_SNAPSHOT]
+        return {id_equipo: dict(zip(campos, valores)) for id_equipo, valores in zip(ids, zip(nombres, *columnas))}
+    
+    def sumar(self, campos):
+        """Devuelve la suma de cada una de las columnas numéricas indicadas."""
+        return [int(self.columnas[campo].sum(dtype=np.int64)) for campo in campos]
+    
+    def agregados(self):
+        """Calcula los totales y promedios de la liga a partir de las columnas."""
+        total_partidos, total_goles, total_puntos = self.sumar(("partidos_jugados", "goles_a_favor",
+                                                                "puntos_totales"))
+        return {
+            "equipos": self.n_equipos,
+            "partidos": total_partidos,
+            "goles": total_goles,
+            "puntos": total_puntos,
+            "promedio_goles": round(total_goles / total_partidos, 2) if total_partidos > 0 else 0,
+            "promedio_puntos": round(total_puntos / total_partidos, 2) if total_partidos > 0 else 0
+        }
+
+def abrir_snapshot():
+    """Abre el snapshot de equipos y lo reconstruye si falta, está dañado o no es de esta base de datos.
+
+    Las escrituras de esta aplicación ya dejan el snapshot al día; la reconstrucción aquí solo
+    ocurre si otro programa cambió la base de datos. El snapshot vale si coinciden el
+    identificador de la base de datos y la versión de los datos; el identificador evita aceptar
+    un snapshot de un archivo recreado o restaurado cuyo contador de versión haya vuelto a
+    llegar al mismo número. Devuelve None si no se puede reconstruir (directorio sin permiso
+    de escritura, archivo bloqueado por otro proceso...); entonces se lee SQLite directamente.
+    """
+    ruta = ruta_snapshot()
+    with sqlite3.connect(DB_FILE) as conn:
+        clave = (id_base_datos(conn), version_datos(conn))
+    try:
+        snapshot = SnapshotEquipos(ruta)
+        if (snapshot.id_base_datos, snapshot.version) == clave:
+            return snapshot
+        # Se libera el mapeo antes de reemplazar el archivo (Windows no permite sustituirlo abierto)
+        del snapshot
+    except (OSError, ValueError):
+        pass
+    try:
+        escribir_snapshot()
+        return SnapshotEquipos(ruta)
+    except (OSError, ValueError, sqlite3.Error):
+        return None
+
+def leer_equipos():
+    """Devuelve {id_equipo: datos} de todos los equipos, del snapshot o, si no se puede abrir, de SQLite."""
+    snapshot = abrir_snapshot()
+    return snapshot.equipos() if snapshot is not None else cargar_datos()
+
+def tomar_instantanea():
+    """Devuelve la versión de los datos y todos los equipos de un mismo estado de la base de datos.
+
+    El snapshot se escribe dentro de una única transacción de lectura, así que sus equipos y
+    su versión siempre se corresponden; sin snapshot se leen ambos en una transacción de SQLite.
+    """
+    snapshot = abrir_snapshot()
+    if snapshot is not None:
+        return snapshot.version, snapshot.equipos()
+    with sqlite3.connect(DB_FILE) as conn:
+        conn.execute("BEGIN")
+        version = version_datos(conn)
+        equipos_db = _cargar_equipos(conn.cursor())
+        conn.commit()
+    return version, equipos_db
+
+def publicar(salidas=("csv", "excel", "graficos", "pdf"), lang="es"):
+    """Genera todas las salidas pedidas a partir de una sola lectura consistente de la base de datos.
+
+    CSV, Excel y gráficos se generan en paralelo; el PDF espera a los gráficos porque
+    incrusta sus imágenes; si se pide el PDF, los gráficos se generan siempre desde la misma
+    lectura para no incrustar PNG de un estado anterior. Escribe un manifiesto JSON con los archivos y tiempos de cada
+    salida y devuelve la ruta del manifiesto.
+    """
+    inicio = time.perf_counter()
+    version, equipos_db = tomar_instantanea()
+    if not equipos_db:
+        raise ValueError("No hay equipos para publicar.")
+    tiempo_lectura = time.perf_counter() - inicio
+    
+    tareas = {
+        "csv": lambda: exportar_a_csv(equipos_db),
+        "excel": lambda: exportar_a_excel(equipos_db),
+        "graficos": lambda: graficar_estadisticas(equipos_db=equipos_db),
+        "pdf": lambda: generar_informe_pdf(lang, equipos_db)
+    }
+    desconocidas = set(salidas) - tareas.keys()
+    if desconocidas:
+        raise ValueError(f"Salidas desconocidas: {', '.join(sorted(desconocidas))}")
+    salidas = tuple(salidas)
+    if "pdf" in salidas and "graficos" not in salidas:
+        salidas += ("graficos",)
+    
+    def cronometrar(nombre):
+        comienzo = time.perf_counter()
+        archivos = tareas[nombre]()
+        return {"archivos": archivos if isinstance(archivos, list) else [archivos],
+                "segundos": round(time.perf_counter() - comienzo, 3)}
+    
+    resultados = {}
+    with ThreadPoolExecutor() as pool:
+        futuros = {nombre: pool.submit(cronometrar, nombre) for nombre in salidas if nombre != "pdf"}
+        for nombre, futuro in futuros.items():
+            resultados[nombre] = futuro.result()
+        if "pdf" in salidas:
+            resultados["pdf"] = cronometrar("pdf")
+    
+    manifiesto = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "base_de_datos": DB_FILE,
+        "version_datos": version,
+        "equipos": len(equipos_db),
+        "lectura_segundos": round(tiempo_lectura, 3),
+        "salidas": resultados,
+        "total_segundos": round(time.perf_counter() - inicio, 3)
+    }
+    manifest_file = f"publicacion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(manifest_file, 'w', encoding='utf-8') as file:
+        json.dump(manifiesto, file, ensure_ascii=False, indent=4)
+    return manifest_file
+
 class App:
     def __init__(self, root):
         self.root = root
         self.lang = "es"
+        self.modo_virtual = False
         self.root.title(TRADUCCIONES[self.lang]["title"])
         
         style = ttk.Style()
@@ -585,6 +1962,7 @@ class App:
         self.search_var.trace("w", self.filtrar_tabla)
         
         self.pagina_actual = 0
+        self.inicio_ventana = 0
         self.pagination_frame = ttk.Frame(self.main_frame)
         self.pagination_frame.grid(row=2, column=0, columnspan=2, pady=5)
         ttk.Button(self.pagination_frame, text=TRADUCCIONES[self.lang]["prev_page"], 
@@ -593,17 +1971,22 @@ class App:
         self.pagination_label.grid(row=0, column=1, padx=5)
         ttk.Button(self.pagination_frame, text=TRADUCCIONES[self.lang]["next_page"], 
                    command=self.pagina_siguiente).grid(row=0, column=2, padx=5)
+        self.virtual_var = tk.BooleanVar(value=self.modo_virtual)
+        ttk.Checkbutton(self.pagination_frame, text=TRADUCCIONES[self.lang]["virtual_scroll"],
+                        variable=self.virtual_var, command=self.cambiar_modo_virtual).grid(row=0, column=3, padx=5)
         
         self.sort_column = None
         self.sort_reverse = False
         self.tree = ttk.Treeview(self.main_frame, columns=("ID", "Nombre", "Partidos", "Puntos", 
                                                            "Goles a favor", "Goles en contra", 
                                                            "Puntos local", "Puntos visitante", 
-                                                           "Diferencia", "Porcentaje", "Goles/partido"),
+                                                           "Diferencia", "Porcentaje", "Goles/partido",
+                                                           "Ataque", "Defensa"),
                                  show="headings")
         headers = [TRADUCCIONES[self.lang][key] for key in 
                    ["id", "nombre", "partidos", "puntos", "goles_favor", "goles_contra", 
-                    "puntos_local", "puntos_visitante", "diferencia", "porcentaje", "goles_partido"]]
+                    "puntos_local", "puntos_visitante", "diferencia", "porcentaje", "goles_partido",
+                    "ataque", "defensa"]]
         for i, header in enumerate(headers):
             self.tree.heading(i, text=header, command=lambda col=i: self.ordenar_tabla(col))
         self.tree.column("ID", width=80)
@@ -617,9 +2000,18 @@ class App:
         self.tree.column("Diferencia", width=100)
         self.tree.column("Porcentaje", width=100)
         self.tree.column("Goles/partido", width=100)
+        self.tree.column("Ataque", width=80)
+        self.tree.column("Defensa", width=80)
         self.tree.grid(row=3, column=0, columnspan=2, pady=10)
         self.tree.bind("<<TreeviewSelect>>", self.cargar_datos_seleccionados)
+        self.tree.bind("<MouseWheel>", self.rueda_raton)
+        self.tree.bind("<Button-4>", self.rueda_raton)
+        self.tree.bind("<Button-5>", self.rueda_raton)
+        self.scrollbar = ttk.Scrollbar(self.main_frame, orient=tk.VERTICAL, command=self.desplazar_ventana)
+        self.scrollbar.grid(row=3, column=2, sticky="ns", pady=10)
         
+        self._inicializar_estado_tabla()
+        self.aplicar_modo_virtual()
         self.actualizar_tabla()
         
         labels = [TRADUCCIONES[self.lang][key] for key in 
@@ -637,7 +2029,9 @@ class App:
         
         ranking_button = ttk.Button(self.main_frame, text=TRADUCCIONES[self.lang]["ranking"], 
                                    command=self.mostrar_ranking)
-        ranking_button.grid(row=15, column=0, columnspan=2, pady=5)
+        ranking_button.grid(row=15, column=0, pady=5)
+        ttk.Button(self.main_frame, text=TRADUCCIONES[self.lang]["registrar_jornada"], 
+                   command=self.registrar_jornada).grid(row=15, column=1, pady=5)
         
         button_frame = ttk.Frame(self.main_frame)
         button_frame.grid(row=16, column=0, columnspan=2, pady=10)
@@ -658,7 +2052,33 @@ class App:
         ttk.Button(button_frame, text=TRADUCCIONES[self.lang]["importar_csv"], 
                    command=self.importar_csv).grid(row=1, column=3, padx=5, pady=5)
         ttk.Button(button_frame, text=TRADUCCIONES[self.lang]["exportar_excel"], 
-                   command=self.exportar_excel).grid(row=2, column=0, columnspan=4, pady=5)
+                   command=self.exportar_excel).grid(row=2, column=0, pady=5)
+        ttk.Button(button_frame, text=TRADUCCIONES[self.lang]["publicar"], 
+                   command=self.publicar).grid(row=2, column=1, pady=5)
+        ttk.Button(button_frame, text=TRADUCCIONES[self.lang]["sincronizar_csv"], 
+                   command=self.sincronizar_csv).grid(row=2, column=2, pady=5)
+        ttk.Button(button_frame, text=TRADUCCIONES[self.lang]["simular"], 
+                   command=self.simular_temporada).grid(row=2, column=3, pady=5)
+        ttk.Button(button_frame, text=TRADUCCIONES[self.lang]["exportar_ndjson"], 
+                   command=self.exportar_ndjson).grid(row=3, column=0, columnspan=2, pady=5)
+        ttk.Button(button_frame, text=TRADUCCIONES[self.lang]["importar_json"], 
+                   command=self.importar_json).grid(row=3, column=2, columnspan=2, pady=5)
+    
+    def _inicializar_estado_tabla(self):
+        """Vacía el estado de las filas de la tabla y de los equipos cargados."""
+        # Estado de las filas presentes en el Treeview: id_equipo -> iid y valores mostrados
+        self.iids = {}
+        self.ids_por_iid = {}
+        self.valores_tree = {}
+        self.orden_tree = []
+        # Equipos cargados: snapshot por columnas, posiciones que pasan el filtro (en orden de ID)
+        # y posiciones en el orden mostrado; solo la ventana visible se convierte en diccionarios
+        self.snapshot = SnapshotEquipos.desde_equipos({})
+        self.totales_liga = [0] * len(CAMPOS_RATING)
+        self.filas_filtradas = np.arange(0)
+        self.vista = np.arange(0)
+        self.equipos_ventana = {}
+        self.ratings_ventana = {}
     
     def cambiar_idioma(self, *args):
         """Cambia el idioma de la interfaz."""
@@ -677,6 +2097,15 @@ class App:
         self.output.delete(1.0, tk.END)
         self.output.insert(tk.END, output)
     
+    def registrar_jornada(self):
+        """Registra la clasificación actual en el historial de jornadas."""
+        try:
+            jornada = registrar_jornada()
+            self.output.delete(1.0, tk.END)
+            self.output.insert(tk.END, f"Jornada {jornada} registrada en el historial\n")
+        except ValueError as e:
+            messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
+    
     def ordenar_tabla(self, col):
         """Ordena la tabla por la columna seleccionada."""
         if self.sort_column == col:
@@ -684,82 +2113,172 @@ class App:
         else:
             self.sort_column = col
             self.sort_reverse = False
-        
-        key_map = {
-            0: "id_equipo",
-            1: "nombre",
-            2: "partidos_jugados",
-            3: "puntos_totales",
-            4: "goles_a_favor",
-            5: "goles_en_contra",
-            6: "puntos_local",
-            7: "puntos_visitante",
-            8: "diferencia_goles",
-            9: "porcentaje_victorias",
-            10: "goles_por_partido"
-        }
-        
-        equipos_db = cargar_datos()
-        equipos = [(id_equipo, equipo) for id_equipo, equipo in equipos_db.items()]
-        if col == 0:
-            equipos.sort(key=lambda x: x[0], reverse=self.sort_reverse)
-        elif col == 1:
-            equipos.sort(key=lambda x: x[1]["nombre"], reverse=self.sort_reverse)
+        self._ordenar_vista()
+        self._renderizar_ventana()
+    
+    def _ordenar_vista(self):
+        """Ordena las posiciones visibles según la columna activa con una ordenación estable de NumPy."""
+        filas = self.filas_filtradas
+        if self.sort_column is None:
+            self.vista = filas
+            return
+        campo = CAMPOS_COLUMNAS[self.sort_column]
+        if self.sort_column == 0:
+            # Las filas del snapshot ya están en orden de ID
+            valores = filas
+        elif campo in ("ataque", "defensa"):
+            valores = self._ratings(filas)[campo]
         else:
-            equipos.sort(key=lambda x: x[1][key_map[col]], reverse=self.sort_reverse)
-        
-        self.actualizar_tabla(self.search_var.get(), equipos_filtrados=equipos)
+            valores = self.snapshot.columnas[campo][filas]
+        if self.sort_reverse:
+            # Descendente conservando el orden por ID entre empates, igual que sort(reverse=True)
+            orden = len(filas) - 1 - np.argsort(valores[::-1], kind="stable")[::-1]
+        else:
+            orden = np.argsort(valores, kind="stable")
+        self.vista = filas[orden]
     
-    def actualizar_tabla(self, filtro="", equipos_filtrados=None):
-        """Actualiza la tabla con los datos de los equipos."""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        equipos_db = cargar_datos()
-        if equipos_filtrados is None:
-            equipos_filtrados = [(id_equipo, equipo) for id_equipo, equipo in equipos_db.items()
-                                if filtro.lower() in id_equipo.lower() or 
-                                filtro.lower() in equipo["nombre"].lower()]
-        
-        total_paginas = max(1, (len(equipos_filtrados) + EQUIPOS_POR_PAGINA - 1) // EQUIPOS_POR_PAGINA)
-        self.pagina_actual = min(self.pagina_actual, total_paginas - 1)
-        inicio = self.pagina_actual * EQUIPOS_POR_PAGINA
-        fin = min(inicio + EQUIPOS_POR_PAGINA, len(equipos_filtrados))
-        
-        for id_equipo, equipo in equipos_filtrados[inicio:fin]:
-            self.tree.insert("", "end", values=(id_equipo, equipo["nombre"], 
-                                                equipo["partidos_jugados"], 
-                                                equipo["puntos_totales"], 
-                                                equipo["goles_a_favor"], 
-                                                equipo["goles_en_contra"], 
-                                                equipo["puntos_local"], 
-                                                equipo["puntos_visitante"], 
-                                                equipo["diferencia_goles"],
-                                                equipo["porcentaje_victorias"],
-                                                equipo["goles_por_partido"]))
+    def _valores_fila(self, id_equipo):
+        """Devuelve los valores que muestra la tabla para un equipo."""
+        equipo = self.equipos_ventana[id_equipo]
+        return ((id_equipo,) + tuple(equipo[campo] for campo in CAMPOS_COLUMNAS[1:-2])
+                + self.ratings_ventana[id_equipo])
+    
+    def _recargar_snapshot(self):
+        """Abre el snapshot actual o, si no se puede, construye uno en memoria leyendo SQLite."""
+        # Se suelta el mapeo anterior para que abrir_snapshot pueda reemplazar el archivo (Windows)
+        self.snapshot = None
+        snapshot = abrir_snapshot()
+        self.snapshot = snapshot if snapshot is not None else SnapshotEquipos.desde_equipos(cargar_datos())
+        self.totales_liga = self.snapshot.sumar(CAMPOS_RATING)
+    
+    def actualizar_tabla(self, filtro=None):
+        """Recarga los equipos y sincroniza la tabla aplicando solo los cambios.
+
+        Filtro y orden se calculan con NumPy sobre las columnas del snapshot; solo los equipos
+        de la página o ventana visible se leen como diccionarios.
+        """
+        if filtro is None:
+            filtro = self.search_var.get()
+        self._recargar_snapshot()
+        self.filas_filtradas = self.snapshot.filtrar(filtro)
+        self._ordenar_vista()
+        self._renderizar_ventana()
+    
+    def _ratings(self, filas):
+        """Calcula ataque y defensa de los equipos en las posiciones dadas con los totales de la liga."""
+        columnas = [self.snapshot.columnas[campo][filas] for campo in CAMPOS_RATING]
+        return calcular_ratings(*columnas, totales=self.totales_liga)
+    
+    def _renderizar_ventana(self):
+        """Calcula las filas visibles (página o ventana virtual) y las sincroniza."""
+        total = len(self.vista)
+        if self.modo_virtual:
+            self.inicio_ventana = max(0, min(self.inicio_ventana, total - FILAS_VENTANA_VIRTUAL))
+            inicio = self.inicio_ventana
+            fin = min(inicio + FILAS_VENTANA_VIRTUAL, total)
+            if total:
+                self.scrollbar.set(inicio / total, fin / total)
+            else:
+                self.scrollbar.set(0, 1)
+            texto = TRADUCCIONES[self.lang]["rows_label"].format(inicio + 1 if total else 0, fin, total)
+        else:
+            total_paginas = max(1, (total + EQUIPOS_POR_PAGINA - 1) // EQUIPOS_POR_PAGINA)
+            self.pagina_actual = min(self.pagina_actual, total_paginas - 1)
+            inicio = self.pagina_actual * EQUIPOS_POR_PAGINA
+            fin = min(inicio + EQUIPOS_POR_PAGINA, total)
+            texto = TRADUCCIONES[self.lang]["page_label"].format(self.pagina_actual + 1, total_paginas)
+        filas = self.vista[inicio:fin]
+        self.equipos_ventana = dict(self.snapshot.filas(filas))
+        ids = list(self.equipos_ventana)
+        ratings = self._ratings(filas)
+        self.ratings_ventana = {id_equipo: (ratings["ataque"][i], ratings["defensa"][i])
+                                for i, id_equipo in enumerate(ids)}
+        self._aplicar_diff(ids)
+        self.pagination_label.config(text=texto)
+    
+    def _aplicar_diff(self, ids):
+        """Lleva el Treeview a la lista de IDs dada con inserciones, ediciones, borrados y movimientos mínimos."""
+        objetivo = set(ids)
+        for id_equipo in self.orden_tree:
+            if id_equipo not in objetivo:
+                iid = self.iids.pop(id_equipo)
+                del self.ids_por_iid[iid]
+                del self.valores_tree[id_equipo]
+                self.tree.delete(iid)
+        self.orden_tree = [id_equipo for id_equipo in self.orden_tree if id_equipo in objetivo]
         
-        self.pagination_label.config(text=TRADUCCIONES[self.lang]["page_label"].format(self.pagina_actual + 1, total_paginas))
+        for posicion, id_equipo in enumerate(ids):
+            valores = self._valores_fila(id_equipo)
+            if id_equipo not in self.iids:
+                iid = self.tree.insert("", posicion, values=valores)
+                self.iids[id_equipo] = iid
+                self.ids_por_iid[iid] = id_equipo
+                self.valores_tree[id_equipo] = valores
+                self.orden_tree.insert(posicion, id_equipo)
+                continue
+            if self.valores_tree[id_equipo] != valores:
+                self.tree.item(self.iids[id_equipo], values=valores)
+                self.valores_tree[id_equipo] = valores
+            if self.orden_tree[posicion] != id_equipo:
+                self.orden_tree.remove(id_equipo)
+                self.orden_tree.insert(posicion, id_equipo)
+                self.tree.move(self.iids[id_equipo], "", posicion)
+    
+    def cambiar_modo_virtual(self):
+        """Alterna entre la paginación fija y el desplazamiento virtual."""
+        self.modo_virtual = self.virtual_var.get()
+        self.aplicar_modo_virtual()
+        self._renderizar_ventana()
+    
+    def aplicar_modo_virtual(self):
+        """Ajusta la altura de la tabla y la barra de desplazamiento al modo activo."""
+        if self.modo_virtual:
+            self.tree.configure(height=FILAS_VENTANA_VIRTUAL)
+            self.scrollbar.grid()
+        else:
+            self.tree.configure(height=EQUIPOS_POR_PAGINA)
+            self.scrollbar.grid_remove()
+    
+    def desplazar_ventana(self, *args):
+        """Mueve la ventana virtual en respuesta a la barra de desplazamiento."""
+        if not self.modo_virtual:
+            return
+        total = len(self.vista)
+        if args[0] == "moveto":
+            inicio = int(float(args[1]) * total)
+        else:
+            paso = int(args[1])
+            if args[2] == "pages":
+                paso *= FILAS_VENTANA_VIRTUAL
+            inicio = self.inicio_ventana + paso
+        self.inicio_ventana = max(0, min(inicio, total - FILAS_VENTANA_VIRTUAL))
+        self._renderizar_ventana()
+    
+    def rueda_raton(self, event):
+        """Desplaza la ventana virtual con la rueda del ratón."""
+        if not self.modo_virtual:
+            return None
+        direccion = -1 if event.num == 4 or event.delta > 0 else 1
+        self.desplazar_ventana("scroll", direccion * 3, "units")
+        return "break"
     
     def pagina_anterior(self):
         """Navega a la página anterior."""
         if self.pagina_actual > 0:
             self.pagina_actual -= 1
-            self.filtrar_tabla()
+            self._renderizar_ventana()
     
     def pagina_siguiente(self):
         """Navega a la página siguiente."""
-        equipos_db = cargar_datos()
-        equipos_filtrados = [(id_equipo, equipo) for id_equipo, equipo in equipos_db.items()
-                            if self.search_var.get().lower() in id_equipo.lower() or 
-                            self.search_var.get().lower() in equipo["nombre"].lower()]
-        total_paginas = (len(equipos_filtrados) + EQUIPOS_POR_PAGINA - 1) // EQUIPOS_POR_PAGINA
+        total_paginas = (len(self.vista) + EQUIPOS_POR_PAGINA - 1) // EQUIPOS_POR_PAGINA
         if self.pagina_actual < total_paginas - 1:
             self.pagina_actual += 1
-            self.filtrar_tabla()
+            self._renderizar_ventana()
     
     def filtrar_tabla(self, *args):
         """Filtra la tabla según el texto en el campo de búsqueda."""
         self.pagina_actual = 0
+        self.inicio_ventana = 0
         self.actualizar_tabla(self.search_var.get())
     
     def cargar_datos_seleccionados(self, event):
@@ -768,6 +2287,7 @@ class App:
         if selected:
             item = self.tree.item(selected[0])
             values = item["values"]
+            equipo = self.equipos_ventana[self.ids_por_iid[selected[0]]]
             labels = [TRADUCCIONES[self.lang][key] for key in 
                       ["id_equipo", "nombre_equipo", "partidos_jugados", "ganados", 
                        "empatados", "perdidos", "goles_a_favor", "goles_en_contra", 
@@ -779,12 +2299,11 @@ class App:
             self.entries[labels[2]].delete(0, tk.END)
             self.entries[labels[2]].insert(0, values[2])
             self.entries[labels[3]].delete(0, tk.END)
-            equipos_db = cargar_datos()
-            self.entries[labels[3]].insert(0, equipos_db[values[0]]["ganados"])
+            self.entries[labels[3]].insert(0, equipo["ganados"])
             self.entries[labels[4]].delete(0, tk.END)
-            self.entries[labels[4]].insert(0, equipos_db[values[0]]["empatados"])
+            self.entries[labels[4]].insert(0, equipo["empatados"])
             self.entries[labels[5]].delete(0, tk.END)
-            self.entries[labels[5]].insert(0, equipos_db[values[0]]["perdidos"])
+            self.entries[labels[5]].insert(0, equipo["perdidos"])
             self.entries[labels[6]].delete(0, tk.END)
             self.entries[labels[6]].insert(0, values[4])
             self.entries[labels[7]].delete(0, tk.END)
@@ -811,8 +2330,8 @@ class App:
             puntos_local = int(self.entries[labels[8]].get())
             puntos_visitante = int(self.entries[labels[9]].get())
             
-            crear_equipo(id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos,
-                         goles_a_favor, goles_en_contra, puntos_local, puntos_visitante)
+            id_equipo = crear_equipo(id_equipo, nombre, partidos_jugados, ganados, empatados, perdidos,
+                                     goles_a_favor, goles_en_contra, puntos_local, puntos_visitante)
             self.output.delete(1.0, tk.END)
             self.output.insert(tk.END, f"Equipo {nombre} agregado con ID {id_equipo}\n")
             self.actualizar_tabla()
@@ -876,9 +2395,24 @@ class App:
     
     def generar_graficos(self):
         try:
-            graficar_estadisticas()
+            archivos = graficar_estadisticas()
             self.output.delete(1.0, tk.END)
-            self.output.insert(tk.END, "Gráficos generados: puntos_totales.html, goles.html, puntos_local_visitante.html, porcentaje_victorias.html\n")
+            self.output.insert(tk.END, f"Gráficos generados: {', '.join(archivos)}\n")
+        except ValueError as e:
+            messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
+    
+    def simular_temporada(self):
+        try:
+            proyeccion = simular_temporada()
+            output = f"{TRADUCCIONES[self.lang]['simular']}:\n"
+            output += "Nombre | Puntos esperados | Campeón | Clasificación | Descenso\n"
+            output += "-" * 60 + "\n"
+            for _, fila in proyeccion.iterrows():
+                output += (f"{fila['nombre']} | {fila['puntos_esperados']} | "
+                           f"{fila['prob_campeon']:.1%} | {fila['prob_clasificacion']:.1%} | "
+                           f"{fila['prob_descenso']:.1%}\n")
+            self.output.delete(1.0, tk.END)
+            self.output.insert(tk.END, output)
         except ValueError as e:
             messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
     
@@ -890,6 +2424,14 @@ class App:
         except Exception as e:
             messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
     
+    def publicar(self):
+        try:
+            manifest_file = publicar(lang=self.lang)
+            self.output.delete(1.0, tk.END)
+            self.output.insert(tk.END, f"Publicación completada. Manifiesto: {manifest_file}\n")
+        except Exception as e:
+            messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
+    
     def exportar_csv(self):
         try:
             csv_file = exportar_a_csv()
@@ -908,6 +2450,47 @@ class App:
         except ValueError as e:
             messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
     
+    def sincronizar_csv(self):
+        try:
+            file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
+            if not file_path:
+                return
+            eliminar_ausentes = messagebox.askyesno(TRADUCCIONES[self.lang]["sincronizar_csv"],
+                                                    TRADUCCIONES[self.lang]["eliminar_ausentes"])
+            resumen = sincronizar_desde_csv(file_path, eliminar_ausentes)
+            self.output.delete(1.0, tk.END)
+            self.output.insert(tk.END, f"Datos sincronizados desde: {file_path}\n"
+                                       f"Insertados: {resumen['insertados']} | "
+                                       f"Actualizados: {resumen['actualizados']} | "
+                                       f"Omitidos: {resumen['omitidos']} | "
+                                       f"Eliminados: {resumen['eliminados']}\n")
+            self.actualizar_tabla()
+        except ValueError as e:
+            messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
+    
+    def exportar_ndjson(self):
+        try:
+            ndjson_file = exportar_a_ndjson()
+            self.output.delete(1.0, tk.END)
+            self.output.insert(tk.END, f"Datos exportados a: {ndjson_file}\n")
+        except ValueError as e:
+            messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
+    
+    def importar_json(self):
+        try:
+            file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json *.ndjson *.jsonl")])
+            if not file_path:
+                return
+            resumen = importar_desde_json(file_path)
+            self.output.delete(1.0, tk.END)
+            self.output.insert(tk.END, f"Datos importados desde: {file_path}\n"
+                                       f"Insertados: {resumen['insertados']} | "
+                                       f"Actualizados: {resumen['actualizados']} | "
+                                       f"Omitidos: {resumen['omitidos']}\n")
+            self.actualizar_tabla()
+        except ValueError as e:
+            messagebox.showerror(TRADUCCIONES[self.lang]["error"], str(e))
+    
     def exportar_excel(self):
         try:
             excel_file = exportar_a_excel()
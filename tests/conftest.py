@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import equiposDeFutbol
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Módulo equiposDeFutbol apuntando a una base de datos temporal recién migrada."""
+    monkeypatch.setattr(equiposDeFutbol, "DB_FILE", str(tmp_path / "equipos_test.db"))
+    monkeypatch.chdir(tmp_path)
+    equiposDeFutbol.init_db()
+    return equiposDeFutbol
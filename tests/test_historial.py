@@ -0,0 +1,83 @@
+import sqlite3
+
+import pytest
+
+
+def _jugar(db, id_equipo, ganados=0, empatados=0, perdidos=0, goles_a_favor=0, goles_en_contra=0):
+    """Suma el resultado de una jornada a un equipo existente."""
+    equipo = db.leer_equipo(id_equipo)
+    partidos = ganados + empatados + perdidos
+    db.actualizar_equipo(
+        id_equipo,
+        partidos_jugados=equipo["partidos_jugados"] + partidos,
+        ganados=equipo["ganados"] + ganados,
+        empatados=equipo["empatados"] + empatados,
+        perdidos=equipo["perdidos"] + perdidos,
+        goles_a_favor=equipo["goles_a_favor"] + goles_a_favor,
+        goles_en_contra=equipo["goles_en_contra"] + goles_en_contra,
+        puntos_local=equipo["puntos_local"] + ganados * 3 + empatados
+    )
+
+
+def _tipos_de_jornada(db):
+    with sqlite3.connect(db.DB_FILE) as conn:
+        return conn.execute("SELECT jornada, checkpoint FROM historial_jornadas ORDER BY jornada").fetchall()
+
+
+def test_reconstruye_jornadas_pasadas_a_ambos_lados_de_un_checkpoint(db):
+    for id_equipo in ("A", "B", "C"):
+        db.crear_equipo(id_equipo, f"Equipo {id_equipo}", 0, 0, 0, 0, 0, 0, 0, 0)
+    esperado = {}
+    for jornada in range(1, db.INTERVALO_CHECKPOINT + 3):
+        _jugar(db, "A", ganados=1, goles_a_favor=2, goles_en_contra=jornada % 2)
+        _jugar(db, "B", perdidos=1, goles_en_contra=2)
+        if jornada % 3:
+            _jugar(db, "C", empatados=1, goles_a_favor=1, goles_en_contra=1)
+        if jornada == 4:
+            db.actualizar_equipo("B", nombre="Equipo B renombrado")
+        assert db.registrar_jornada() == jornada
+        esperado[jornada] = db.cargar_datos()
+
+    checkpoints = [jornada for jornada, checkpoint in _tipos_de_jornada(db) if checkpoint]
+    assert checkpoints == [1, db.INTERVALO_CHECKPOINT + 1]
+    for jornada, equipos in esperado.items():
+        assert db.equipos_en_jornada(jornada) == equipos
+        assert db.equipo_en_jornada("B", jornada) == equipos["B"]
+
+
+def test_equipo_eliminado_y_vuelto_a_crear(db):
+    db.crear_equipo("A", "Equipo A", 2, 1, 1, 0, 3, 1, 4, 0)
+    db.crear_equipo("X", "Equipo X", 2, 2, 0, 0, 5, 0, 6, 0)
+    db.registrar_jornada()
+    db.eliminar_equipo("X")
+    db.registrar_jornada()
+    db.crear_equipo("X", "Nuevo X", 1, 0, 0, 1, 0, 2, 0, 0)
+    db.registrar_jornada()
+    nuevo_x = db.leer_equipo("X")
+
+    assert db.equipo_en_jornada("X", 1)["nombre"] == "Equipo X"
+    with pytest.raises(ValueError):
+        db.equipo_en_jornada("X", 2)
+    assert "X" not in db.equipos_en_jornada(2)
+    assert db.equipo_en_jornada("X", 3) == nuevo_x
+
+    # Eliminado antes de un checkpoint y recreado después de él
+    db.eliminar_equipo("X")
+    while len(_tipos_de_jornada(db)) < db.INTERVALO_CHECKPOINT + 1:
+        db.registrar_jornada()
+    assert _tipos_de_jornada(db)[-1] == (db.INTERVALO_CHECKPOINT + 1, 1)
+    assert "X" not in db.equipos_en_jornada(db.INTERVALO_CHECKPOINT + 1)
+    db.crear_equipo("X", "Otra vez X", 3, 1, 1, 1, 4, 4, 3, 1)
+    jornada = db.registrar_jornada()
+    assert db.equipo_en_jornada("X", jornada) == db.leer_equipo("X")
+    assert db.equipo_en_jornada("X", 3) == nuevo_x
+
+
+def test_evolucion_ranking(db):
+    db.crear_equipo("A", "Equipo A", 1, 1, 0, 0, 2, 0, 3, 0)
+    db.crear_equipo("B", "Equipo B", 1, 0, 0, 1, 0, 2, 0, 0)
+    db.registrar_jornada()
+    _jugar(db, "B", ganados=2, goles_a_favor=4)
+    db.registrar_jornada()
+
+    assert db.evolucion_ranking() == {"A": [(1, 1), (2, 2)], "B": [(1, 2), (2, 1)]}
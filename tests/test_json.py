@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+
+def _crear_liga(db):
+    db.crear_equipo("A", "Atlético Ñandú", 10, 6, 2, 2, 18, 9, 12, 8)
+    db.crear_equipo("B", 'Equipo "B"', 10, 4, 3, 3, 12, 11, 9, 6)
+    db.crear_equipo("C", "Equipo C", 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def test_ndjson_ida_y_vuelta(db, tmp_path):
+    _crear_liga(db)
+    equipos = db.cargar_datos()
+    ruta = db.exportar_a_ndjson(str(tmp_path / "equipos.ndjson"))
+    assert dict(db.leer_ndjson(ruta)) == {id_equipo: {"id_equipo": id_equipo, **equipo}
+                                          for id_equipo, equipo in equipos.items()}
+
+    assert db.importar_desde_json(ruta) == {"insertados": 0, "actualizados": 0, "omitidos": 3}
+    for id_equipo in equipos:
+        db.eliminar_equipo(id_equipo)
+    assert db.importar_desde_json(ruta) == {"insertados": 3, "actualizados": 0, "omitidos": 0}
+    assert db.cargar_datos() == equipos
+
+
+def test_json_anidado_con_bloques_pequenos(db, tmp_path):
+    _crear_liga(db)
+    equipos = db.cargar_datos()
+    ruta = tmp_path / "equipos_data.json"
+    ruta.write_text(json.dumps(equipos, ensure_ascii=False, indent=4), encoding="utf-8")
+
+    for tamano_bloque in (1, 3, 7, 64):
+        assert dict(db.leer_json_anidado(str(ruta), tamano_bloque=tamano_bloque)) == equipos
+    for id_equipo in equipos:
+        db.eliminar_equipo(id_equipo)
+    assert db.importar_desde_json(str(ruta))["insertados"] == 3
+    assert db.cargar_datos() == equipos
+
+
+@pytest.mark.parametrize("contenido", ["{}", "  {  }\n\n", '{"A": {"x": 1}}  '])
+def test_json_anidado_admite_espacios_finales(tmp_path, db, contenido):
+    ruta = tmp_path / "liga.json"
+    ruta.write_text(contenido, encoding="utf-8")
+    list(db.leer_json_anidado(str(ruta), tamano_bloque=2))
+
+
+@pytest.mark.parametrize("contenido", ['{"A": {"x": 1}} basura', "{} {}", '{"A": {"x": 1}}]',
+                                       '{"A": {"x": 1}', '["A"]', '{"A" {"x": 1}}'])
+def test_json_anidado_rechaza_contenido_invalido(tmp_path, db, contenido):
+    ruta = tmp_path / "liga.json"
+    ruta.write_text(contenido, encoding="utf-8")
+    for tamano_bloque in (2, 65536):
+        with pytest.raises(ValueError):
+            list(db.leer_json_anidado(str(ruta), tamano_bloque=tamano_bloque))
+
+
+def test_importacion_con_basura_final_no_escribe(db, tmp_path):
+    ruta = tmp_path / "liga.json"
+    ruta.write_text('{"A": {"nombre": "a", "partidos_jugados": 1, "ganados": 1, "empatados": 0, '
+                    '"perdidos": 0, "goles_a_favor": 2, "goles_en_contra": 0, "puntos_local": 3, '
+                    '"puntos_visitante": 0}} x', encoding="utf-8")
+    with pytest.raises(ValueError):
+        db.importar_desde_json(str(ruta))
+    assert db.cargar_datos() == {}
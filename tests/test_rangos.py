@@ -0,0 +1,48 @@
+import pytest
+
+
+def _crear_liga(db):
+    # BOG y CAL empatan a puntos; ARG y CAL empatan a goles en contra
+    db.crear_equipo("ARG", "Argentinos Juniors", 10, 6, 2, 2, 18, 9, 12, 8)
+    db.crear_equipo("BOG", "Independiente Santa Fé", 10, 4, 3, 3, 12, 11, 9, 6)
+    db.crear_equipo("CAL", "América de Cali", 9, 4, 3, 2, 7, 9, 9, 6)
+    db.crear_equipo("MED", "Atlético Nacional", 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def test_rangos_con_empates_y_metrica_donde_menos_es_mejor(db):
+    _crear_liga(db)
+
+    assert db.obtener_rangos("ARG")["puntos_totales"] == (1, 4, 100.0)
+    assert db.obtener_rangos("BOG")["puntos_totales"] == (2, 4, 66.7)
+    assert db.obtener_rangos("CAL")["puntos_totales"] == (2, 4, 66.7)
+    assert db.obtener_rangos("MED")["puntos_totales"] == (4, 4, 0.0)
+
+    assert db.obtener_rangos("MED")["goles_en_contra"] == (1, 4, 100.0)
+    assert db.obtener_rangos("ARG")["goles_en_contra"] == (2, 4, 66.7)
+    assert db.obtener_rangos("CAL")["goles_en_contra"] == (2, 4, 66.7)
+    assert db.obtener_rangos("BOG")["goles_en_contra"] == (4, 4, 0.0)
+
+
+def test_rangos_siguen_a_las_escrituras(db):
+    _crear_liga(db)
+    assert db.obtener_rangos("CAL")["goles_a_favor"] == (3, 4, 33.3)
+
+    db.actualizar_equipo("CAL", goles_a_favor=25)
+    assert db.obtener_rangos("CAL")["goles_a_favor"] == (1, 4, 100.0)
+    assert db.obtener_rangos("ARG")["goles_a_favor"] == (2, 4, 66.7)
+    with pytest.raises(ValueError):
+        db.obtener_rangos("XXX")
+
+
+def test_rangos_sin_snapshot_coinciden(db, monkeypatch):
+    _crear_liga(db)
+    esperados = {id_equipo: db.obtener_rangos(id_equipo) for id_equipo in ("ARG", "BOG", "CAL", "MED")}
+
+    monkeypatch.setattr(db, "abrir_snapshot", lambda: None)
+    for id_equipo, rangos in esperados.items():
+        assert db.obtener_rangos(id_equipo) == rangos
+
+
+def test_un_solo_equipo_es_percentil_100(db):
+    db.crear_equipo("ARG", "Argentinos Juniors", 10, 6, 2, 2, 18, 9, 12, 8)
+    assert set(db.obtener_rangos("ARG").values()) == {(1, 1, 100.0)}
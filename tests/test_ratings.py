@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+
+def test_calcular_elo_con_resultados_conocidos(db):
+    partidos = [
+        (2, "A", "C", 0, 1),
+        (1, "A", "B", 2, 0),
+        (1, "C", "D", 1, 1),
+    ]
+    elo = db.calcular_elo(partidos)
+
+    # Jornada 1: el local con +100 de ventaja espera 0.640; A gana (+7.2) y C empata (-2.8).
+    # Jornada 2: A (1507.2) recibe a C (1497.2), espera 0.653 y pierde (-13.1).
+    assert elo.to_dict() == {"A": 1494.1, "B": 1492.8, "C": 1510.3, "D": 1502.8}
+    assert elo.sum() == pytest.approx(4 * 1500, abs=0.2)
+
+
+def test_calcular_elo_sin_partidos(db):
+    assert db.calcular_elo([]).empty
+
+
+def test_cache_de_ratings_distingue_bases_de_datos_recreadas(db):
+    db.crear_equipo("A", "Equipo A", 2, 2, 0, 0, 6, 0, 6, 0)
+    db.crear_equipo("B", "Equipo B", 2, 0, 0, 2, 0, 6, 0, 0)
+    assert db.obtener_ratings().at["A", "ataque"] == 2.0
+
+    # Misma cantidad de escrituras, otros datos
+    os.remove(db.DB_FILE)
+    db.init_db()
+    db.crear_equipo("A", "Equipo A", 2, 0, 0, 2, 1, 6, 0, 0)
+    db.crear_equipo("B", "Equipo B", 2, 2, 0, 0, 3, 1, 6, 0)
+    assert db.obtener_ratings().at["A", "ataque"] == 0.5
@@ -0,0 +1,74 @@
+import csv
+import sqlite3
+
+import pytest
+
+CABECERA = ["ID", "Nombre", "Partidos jugados", "Ganados", "Empatados", "Perdidos",
+            "Goles a favor", "Goles en contra", "Puntos local", "Puntos visitante"]
+
+EQUIPOS = [
+    ["A", "Equipo A", 3, 2, 1, 0, 6, 2, 4, 3],
+    ["B", "Equipo B", 3, 1, 1, 1, 4, 4, 3, 1],
+    ["C", "Equipo C", 3, 0, 0, 3, 1, 5, 0, 0],
+]
+
+
+def _escribir_csv(ruta, filas):
+    with open(ruta, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(CABECERA)
+        writer.writerows(filas)
+    return str(ruta)
+
+
+def _version(db):
+    with sqlite3.connect(db.DB_FILE) as conn:
+        return db.version_datos(conn)
+
+
+def test_sincronizacion_solo_escribe_filas_cambiadas(db, tmp_path):
+    ruta = _escribir_csv(tmp_path / "liga.csv", EQUIPOS)
+    assert db.sincronizar_desde_csv(ruta) == {"insertados": 3, "actualizados": 0, "omitidos": 0, "eliminados": 0}
+
+    version = _version(db)
+    assert db.sincronizar_desde_csv(ruta) == {"insertados": 0, "actualizados": 0, "omitidos": 3, "eliminados": 0}
+    assert _version(db) == version
+
+    filas = [EQUIPOS[0], ["B", "Equipo B", 4, 2, 1, 1, 6, 4, 6, 1], ["D", "Equipo D", 1, 1, 0, 0, 2, 0, 3, 0]]
+    ruta = _escribir_csv(tmp_path / "liga2.csv", filas)
+    assert db.sincronizar_desde_csv(ruta) == {"insertados": 1, "actualizados": 1, "omitidos": 1, "eliminados": 0}
+    assert db.leer_equipo("B")["puntos_totales"] == 7
+    assert set(db.cargar_datos()) == {"A", "B", "C", "D"}
+
+
+def test_sincronizacion_elimina_ausentes(db, tmp_path):
+    db.sincronizar_desde_csv(_escribir_csv(tmp_path / "liga.csv", EQUIPOS))
+    ruta = _escribir_csv(tmp_path / "liga2.csv", EQUIPOS[:2])
+    assert db.sincronizar_desde_csv(ruta, eliminar_ausentes=True) == {
+        "insertados": 0, "actualizados": 0, "omitidos": 2, "eliminados": 1}
+    assert set(db.cargar_datos()) == {"A", "B"}
+
+
+def test_sincronizacion_detecta_cambios_hechos_desde_la_aplicacion(db, tmp_path):
+    ruta = _escribir_csv(tmp_path / "liga.csv", EQUIPOS)
+    db.sincronizar_desde_csv(ruta)
+    db.actualizar_equipo("C", nombre="Renombrado")
+    assert db.sincronizar_desde_csv(ruta)["actualizados"] == 1
+    assert db.leer_equipo("C")["nombre"] == "Equipo C"
+
+
+def test_sincronizacion_rechaza_filas_invalidas_sin_escribir(db, tmp_path):
+    ruta = _escribir_csv(tmp_path / "liga.csv", EQUIPOS + [["E", "Equipo E", 1, 5, 0, 0, 0, 0, 0, 0]])
+    with pytest.raises(ValueError, match="Equipo E"):
+        db.sincronizar_desde_csv(ruta)
+    assert db.cargar_datos() == {}
+
+
+def test_sincronizacion_rechaza_filas_incompletas(db, tmp_path):
+    ruta = tmp_path / "liga.csv"
+    _escribir_csv(ruta, EQUIPOS)
+    with open(ruta, "a", newline="") as file:
+        file.write("D,Equipo D,3,1\n")
+    with pytest.raises(ValueError, match="fila 5"):
+        db.sincronizar_desde_csv(str(ruta))
+    assert db.cargar_datos() == {}
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+
+import pytest
+
+
+def _crear_liga(db):
+    db.crear_equipo("ARG", "Argentinos Juniors", 10, 6, 2, 2, 18, 9, 12, 8)
+    db.crear_equipo("BOG", "Independiente Santa Fé", 10, 4, 3, 3, 12, 11, 9, 6)
+    db.crear_equipo("CAL", "América de Cali", 9, 2, 2, 5, 7, 13, 6, 2)
+    db.crear_equipo("MED", "Atlético Nacional", 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def test_snapshot_ida_y_vuelta(db):
+    _crear_liga(db)
+    snapshot = db.abrir_snapshot()
+
+    assert len(snapshot) == 4
+    for id_equipo in ("ARG", "BOG", "CAL", "MED"):
+        assert snapshot.buscar(id_equipo) == db.leer_equipo(id_equipo)
+    assert snapshot.equipos() == db.cargar_datos()
+    with pytest.raises(ValueError):
+        snapshot.buscar("XXX")
+
+
+def test_snapshot_consultas(db):
+    _crear_liga(db)
+    snapshot = db.abrir_snapshot()
+    equipos = db.cargar_datos()
+
+    esperado = sorted(equipos.items(), key=lambda x: x[1]["puntos_totales"], reverse=True)[:2]
+    assert snapshot.ordenar("puntos_totales", limite=2) == esperado
+    assert [id_equipo for id_equipo, _ in snapshot.ordenar("goles_en_contra", descendente=False)] == [
+        "MED", "ARG", "BOG", "CAL"]
+    agregados = snapshot.agregados()
+    assert (agregados["promedio_goles"], agregados["promedio_puntos"]) == db.calcular_promedios_liga(equipos)
+
+
+def test_snapshot_se_actualiza_al_escribir(db):
+    _crear_liga(db)
+    db.actualizar_equipo("CAL", nombre="Deportivo Cali")
+    db.eliminar_equipo("MED")
+    db.crear_equipo("AAA-LARGO", "Equipo con un nombre bastante más largo", 3, 1, 1, 1, 4, 4, 3, 1)
+
+    # Sin pasar por abrir_snapshot: las escrituras ya dejan el archivo al día
+    snapshot = db.SnapshotEquipos(db.ruta_snapshot())
+    with sqlite3.connect(db.DB_FILE) as conn:
+        assert snapshot.version == db.version_datos(conn)
+    assert snapshot.equipos() == db.cargar_datos()
+    assert list(snapshot.equipos()) == ["AAA-LARGO", "ARG", "BOG", "CAL"]
+
+
+def test_snapshot_se_reconstruye_si_otro_programa_escribe(db):
+    _crear_liga(db)
+    version = db.abrir_snapshot().version
+    with sqlite3.connect(db.DB_FILE) as conn:
+        conn.execute("UPDATE equipos SET nombre = 'Deportivo Cali' WHERE id_equipo = 'CAL'")
+
+    snapshot = db.abrir_snapshot()
+    assert snapshot.version > version
+    assert snapshot.buscar("CAL") == db.leer_equipo("CAL")
+
+
+def test_sin_snapshot_se_lee_sqlite(db, monkeypatch):
+    _crear_liga(db)
+    os.remove(db.ruta_snapshot())
+
+    def sin_permiso():
+        raise PermissionError("solo lectura")
+
+    monkeypatch.setattr(db, "escribir_snapshot", sin_permiso)
+    db.actualizar_equipo("BOG", nombre="Santa Fe")
+
+    assert db.abrir_snapshot() is None
+    equipos = db.cargar_datos()
+    assert db.tomar_instantanea()[1] == equipos
+    assert db.obtener_ranking() == db.obtener_ranking(equipos)
+    assert db.calcular_promedios_liga() == db.calcular_promedios_liga(equipos)
+
+
+def test_snapshot_de_otra_base_de_datos_no_se_acepta(db):
+    _crear_liga(db)
+    anterior = db.abrir_snapshot()
+    identificador, version = anterior.id_base_datos, anterior.version
+    del anterior
+
+    # Base de datos recreada con el mismo número de escrituras pero otro contenido
+    os.remove(db.DB_FILE)
+    db.init_db()
+    for id_equipo in ("ARG", "BOG", "CAL", "MED"):
+        db.crear_equipo(id_equipo, f"Otro {id_equipo}", 1, 1, 0, 0, 1, 0, 3, 0)
+
+    snapshot = db.abrir_snapshot()
+    assert snapshot.version == version
+    assert snapshot.id_base_datos != identificador
+    assert snapshot.buscar("ARG") == db.leer_equipo("ARG")
+
+
+def test_snapshot_danado_se_reconstruye(db):
+    _crear_liga(db)
+    db.abrir_snapshot()
+    with open(db.ruta_snapshot(), "r+b") as file:
+        file.truncate(100)
+
+    assert db.abrir_snapshot().equipos() == db.cargar_datos()
@@ -0,0 +1,176 @@
+import itertools
+
+import pytest
+
+
+class TreeviewFalso:
+    """Sustituto mínimo de ttk.Treeview que cuenta las operaciones sobre filas."""
+
+    def __init__(self):
+        self.filas = []
+        self.valores = {}
+        self.operaciones = 0
+        self._contador = itertools.count()
+
+    def insert(self, padre, posicion, values):
+        iid = f"I{next(self._contador)}"
+        self.filas.insert(posicion, iid)
+        self.valores[iid] = values
+        self.operaciones += 1
+        return iid
+
+    def delete(self, iid):
+        self.filas.remove(iid)
+        del self.valores[iid]
+        self.operaciones += 1
+
+    def item(self, iid, values):
+        self.valores[iid] = values
+        self.operaciones += 1
+
+    def move(self, iid, padre, posicion):
+        self.filas.remove(iid)
+        self.filas.insert(posicion, iid)
+        self.operaciones += 1
+
+
+class VariableFalsa:
+    def __init__(self, valor):
+        self.valor = valor
+
+    def get(self):
+        return self.valor
+
+
+class WidgetFalso:
+    def config(self, **kwargs):
+        pass
+
+    def set(self, *args):
+        pass
+
+
+@pytest.fixture
+def app(db):
+    app = db.App.__new__(db.App)
+    app.lang = "es"
+    app.modo_virtual = False
+    app.pagina_actual = 0
+    app.inicio_ventana = 0
+    app.sort_column = None
+    app.sort_reverse = False
+    app.search_var = VariableFalsa("")
+    app.tree = TreeviewFalso()
+    app.pagination_label = WidgetFalso()
+    app.scrollbar = WidgetFalso()
+    app._inicializar_estado_tabla()
+    return app
+
+
+def _ids_en_tabla(app):
+    return [app.ids_por_iid[iid] for iid in app.tree.filas]
+
+
+def test_aplicar_diff_solo_toca_las_filas_cambiadas(app):
+    valores = {id_equipo: (id_equipo, 0) for id_equipo in "ABCDE"}
+    app._valores_fila = lambda id_equipo: valores[id_equipo]
+
+    app._aplicar_diff(list("ABCD"))
+    assert _ids_en_tabla(app) == list("ABCD")
+    assert app.tree.operaciones == 4
+
+    app.tree.operaciones = 0
+    valores["B"] = ("B", 1)
+    app._aplicar_diff(list("ABCD"))
+    assert app.tree.operaciones == 1
+    assert app.tree.valores[app.iids["B"]] == ("B", 1)
+
+    app.tree.operaciones = 0
+    app._aplicar_diff(list("ADBE"))
+    assert _ids_en_tabla(app) == list("ADBE")
+    assert app.tree.operaciones == 3  # borrar C, insertar E, mover D
+    assert app.orden_tree == list("ADBE")
+    assert set(app.ids_por_iid.values()) == set("ADBE")
+    for iid in app.tree.filas:
+        assert app.tree.valores[iid] == valores[app.ids_por_iid[iid]]
+
+    app._aplicar_diff([])
+    assert app.tree.filas == [] and app.iids == {} and app.valores_tree == {}
+
+
+def test_equipo_nuevo_aparece_en_su_posicion_por_id(db, app):
+    for id_equipo in ("A", "C", "E"):
+        db.crear_equipo(id_equipo, f"Equipo {id_equipo}", 1, 1, 0, 0, 1, 0, 3, 0)
+    app.actualizar_tabla()
+
+    app.tree.operaciones = 0
+    db.crear_equipo("B", "Equipo B", 1, 0, 1, 0, 1, 1, 1, 0)
+    app.actualizar_tabla()
+    assert _ids_en_tabla(app) == ["A", "B", "C", "E"]
+
+
+def test_edicion_de_un_equipo_es_una_operacion(db, app):
+    for i in range(30):
+        db.crear_equipo(f"E{i:02d}", f"Equipo {i}", 1, 1, 0, 0, 1, 0, 3, 0)
+    app.actualizar_tabla()
+    assert len(app.tree.filas) == db.EQUIPOS_POR_PAGINA
+
+    app.tree.operaciones = 0
+    db.actualizar_equipo("E03", nombre="Renombrado")
+    app.actualizar_tabla()
+    assert app.tree.operaciones == 1
+    assert app.tree.valores[app.iids["E03"]][1] == "Renombrado"
+
+
+def _crear_liga(db):
+    db.crear_equipo("ARG", "Argentinos Juniors", 10, 6, 2, 2, 18, 9, 12, 8)
+    db.crear_equipo("BOG", "Independiente Santa Fé", 10, 4, 3, 3, 12, 11, 9, 6)
+    db.crear_equipo("CAL", "América de Cali", 9, 4, 3, 2, 7, 13, 9, 6)
+    db.crear_equipo("MED", "Atlético Nacional", 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def test_filtro_y_orden_sobre_las_columnas(db, app):
+    _crear_liga(db)
+    app.actualizar_tabla()
+
+    columna_puntos = db.CAMPOS_COLUMNAS.index("puntos_totales")
+    app.ordenar_tabla(columna_puntos)
+    assert _ids_en_tabla(app) == ["MED", "BOG", "CAL", "ARG"]
+    app.ordenar_tabla(columna_puntos)
+    # Descendente: los empates conservan el orden por ID
+    assert _ids_en_tabla(app) == ["ARG", "BOG", "CAL", "MED"]
+
+    app.ordenar_tabla(db.CAMPOS_COLUMNAS.index("nombre"))
+    assert _ids_en_tabla(app) == ["CAL", "ARG", "MED", "BOG"]
+
+    app.ordenar_tabla(db.CAMPOS_COLUMNAS.index("defensa"))
+    ratings = db.obtener_ratings()
+    assert _ids_en_tabla(app) == list(ratings.sort_values("defensa", kind="stable").index)
+
+    app.actualizar_tabla("TIC")
+    assert _ids_en_tabla(app) == ["MED"]
+    app.actualizar_tabla("fé")
+    assert _ids_en_tabla(app) == ["BOG"]
+    app.actualizar_tabla("ATLÉTICO")
+    assert _ids_en_tabla(app) == ["MED"]
+
+
+def test_solo_se_materializa_la_ventana_visible(db, app):
+    for i in range(25):
+        db.crear_equipo(f"E{i:02d}", f"Equipo {i}", 1, 1, 0, 0, 1, 0, 3, 0)
+    app.actualizar_tabla()
+    assert list(app.equipos_ventana) == [f"E{i:02d}" for i in range(db.EQUIPOS_POR_PAGINA)]
+
+    app.pagina_siguiente()
+    app.pagina_siguiente()
+    assert list(app.equipos_ventana) == ["E20", "E21", "E22", "E23", "E24"]
+    assert app.tree.valores[app.iids["E22"]][:2] == ("E22", "Equipo 22")
+
+
+def test_tabla_sin_snapshot_lee_sqlite(db, app, monkeypatch):
+    _crear_liga(db)
+    monkeypatch.setattr(db, "abrir_snapshot", lambda: None)
+    app.actualizar_tabla("a")
+
+    assert _ids_en_tabla(app) == ["ARG", "BOG", "CAL", "MED"]
+    assert app.equipos_ventana["CAL"] == db.leer_equipo("CAL")